@@ -6,84 +6,111 @@ import math
 import threading
 from collections import deque
 import numpy as np
+from jit_utils import njit
+
+@njit(cache=True)
+def _bfs_step(index, shape, strides, visited, score, best_score):
+    """
+    Expand one BFS node of the precomputed settings grid.
+
+    ``index`` is a flat grid index; its six neighbors are one step up/down
+    along each axis (clamped at the grid edges). Neighbors not yet marked in
+    ``visited`` are marked and returned, and ``score`` is folded into the best
+    score. Returns ``(fresh_indices, new_best_score)``.
+    """
+    fresh = np.empty(6, dtype=np.int64)
+    count = 0
+    for i in range(6):
+        axis = i % 3
+        stride = strides[axis]
+        coord = (index // stride) % shape[axis]
+        if i < 3:
+            neighbor = index + stride if coord + 1 < shape[axis] else index
+        else:
+            neighbor = index - stride if coord > 0 else index
+
+        if not visited[neighbor]:
+            visited[neighbor] = True
+            fresh[count] = neighbor
+            count += 1
+
+    if score > best_score:
+        best_score = score
+    return fresh[:count], best_score
+
 
 class AdaptiveSettingsOptimizer:
     """BFS-based optimizer for cursor control settings"""
     
+    # Layout of every settings vector handled by the optimizer
+    PARAMS = ('sensitivity', 'smoothing', 'acceleration')
+    
     def __init__(self):
         # BFS optimization parameters
         self.sensitivity_range = np.arange(0.3, 2.1, 0.1)
         self.smoothing_range = np.arange(0.1, 0.8, 0.05)
         self.acceleration_range = np.arange(1.0, 3.0, 0.1)
         
-        # Current best settings
-        self.best_settings = {'sensitivity': 1.0, 'smoothing': 0.3, 'acceleration': 1.5}
+        # Every reachable setting, enumerated once as an (N, 3) grid
+        ranges = (self.sensitivity_range, self.smoothing_range, self.acceleration_range)
+        self.grid = np.stack(np.meshgrid(*ranges, indexing='ij'), -1).reshape(-1, 3).astype(np.float32)
+        self.grid_shape = np.array([len(r) for r in ranges], dtype=np.int64)
+        self.grid_strides = np.array([self.grid_shape[1] * self.grid_shape[2],
+                                      self.grid_shape[2], 1], dtype=np.int64)
+        
+        # Integer grid coordinate of a value is int(value * scale + 0.5) - offset,
+        # with scales matching the 0.1 / 0.05 / 0.1 step sizes
+        self.step_scales = (10, 20, 10)
+        self.grid_offsets = tuple(int(r[0] * scale + 0.5) for r, scale in zip(ranges, self.step_scales))
+        
+        # Current best settings as a flat grid index
+        self.state_index = self.settings_to_index((1.0, 0.3, 1.5))
         self.best_score = 0.0
         
         # BFS queue and visited states
         self.search_queue = deque()
-        self.visited_settings = set()
+        self.visited_settings = np.zeros(len(self.grid), dtype=bool)
         self.optimization_history = []
         
     def bfs_optimize(self, current_score, user_feedback):
         """Use BFS to find optimal settings based on performance and feedback"""
-        current_settings = self.best_settings.copy()
-        
-        # Add neighboring states to search queue
-        neighbors = self.generate_neighbors(current_settings)
-        
-        for neighbor in neighbors:
-            setting_key = self.settings_to_key(neighbor)
-            if setting_key not in self.visited_settings:
-                self.search_queue.append((neighbor, current_score))
-                self.visited_settings.add(setting_key)
+        current_index = self.state_index
         
         # Process queue with user feedback weight
         feedback_weight = self.interpret_feedback(user_feedback)
         adjusted_score = current_score * feedback_weight
         
-        if adjusted_score > self.best_score:
-            self.best_score = adjusted_score
-            self.best_settings = current_settings.copy()
-            print(f"New best settings found: {self.best_settings} (Score: {adjusted_score:.2f})")
+        # Numeric kernel: neighbor lookup, visited check and score update
+        neighbors, new_best_score = _bfs_step(current_index, self.grid_shape, self.grid_strides,
+                                              self.visited_settings, adjusted_score,
+                                              self.best_score)
         
-        return self.get_next_settings()
-    
-    def generate_neighbors(self, settings):
-        """Generate neighboring settings for BFS exploration"""
-        neighbors = []
-        step_size = {'sensitivity': 0.1, 'smoothing': 0.05, 'acceleration': 0.1}
-        
-        for param in ['sensitivity', 'smoothing', 'acceleration']:
-            # Increase parameter
-            neighbor = settings.copy()
-            neighbor[param] = min(neighbor[param] + step_size[param], 
-                                self.get_max_value(param))
-            neighbors.append(neighbor)
-            
-            # Decrease parameter
-            neighbor = settings.copy()
-            neighbor[param] = max(neighbor[param] - step_size[param], 
-                                self.get_min_value(param))
-            neighbors.append(neighbor)
+        # Add unvisited neighboring states to search queue
+        for neighbor in neighbors:
+            self.search_queue.append((neighbor, current_score))
         
-        return neighbors
-    
-    def get_min_value(self, param):
-        """Get minimum value for parameter"""
-        param_mins = {'sensitivity': 0.3, 'smoothing': 0.1, 'acceleration': 1.0}
-        return param_mins.get(param, 0.1)
+        # state_index already points at the evaluated state, so an improvement
+        # only needs to record the new best score
+        if new_best_score > self.best_score:
+            self.best_score = new_best_score
+            print(f"New best settings found: {self.vector_to_settings(self.grid[current_index])} "
+                  f"(Score: {adjusted_score:.2f})")
+        
+        return self.get_next_settings()
     
-    def get_max_value(self, param):
-        """Get maximum value for parameter"""
-        param_maxs = {'sensitivity': 2.0, 'smoothing': 0.8, 'acceleration': 3.0}
-        return param_maxs.get(param, 2.0)
+    def settings_to_index(self, vec):
+        """Convert a (positive) settings vector to its flat grid index"""
+        index = 0
+        for value, scale, offset, size, stride in zip(vec, self.step_scales, self.grid_offsets,
+                                                      self.grid_shape.tolist(),
+                                                      self.grid_strides.tolist()):
+            coord = int(value * scale + 0.5) - offset
+            index += min(max(coord, 0), size - 1) * stride
+        return index
     
-    def settings_to_key(self, settings):
-        """Convert settings to hashable key"""
-        return (round(settings['sensitivity'], 2), 
-                round(settings['smoothing'], 2), 
-                round(settings['acceleration'], 2))
+    def vector_to_settings(self, vec):
+        """Convert a settings vector to a {param: value} dict"""
+        return {param: round(float(value), 2) for param, value in zip(self.PARAMS, vec)}
     
     def interpret_feedback(self, feedback):
         """Convert user feedback to numerical weight"""
@@ -99,11 +126,11 @@ class AdaptiveSettingsOptimizer:
         return feedback_map.get(feedback, 1.0)
     
     def get_next_settings(self):
-        """Get next settings to try from BFS queue"""
+        """Get next settings vector to try from BFS queue"""
         if self.search_queue:
-            next_settings, _ = self.search_queue.popleft()
-            return next_settings
-        return self.best_settings
+            next_index, _ = self.search_queue.popleft()
+            return self.grid[next_index]
+        return self.grid[self.state_index]
 
 class TrainingGame:
     """Adaptive cursor training game with BFS optimization"""
@@ -120,15 +147,20 @@ class TrainingGame:
         self.total_attempts = 0
         self.successful_attempts = 0
         
+        # Set when level/score/accuracy change; flushed once per event handler
+        self._display_dirty = False
+        
         # Game objects
-        self.targets = []
+        self.targets_by_id = {}  # canvas item id -> {'color', 'half'}
         self.grabbed_target = None
+        self._grabbed_half = 0
         self.drop_zones = []
+        self._rng = np.random.default_rng()
         
-        # Performance tracking
+        # Performance tracking (only the last 3 levels feed the optimizer)
         self.start_time = 0
-        self.completion_times = []
-        self.accuracy_scores = []
+        self.completion_times = deque(maxlen=3)
+        self.accuracy_scores = deque(maxlen=3)
         
         # UI components
         self.game_window = None
@@ -263,9 +295,50 @@ class TrainingGame:
         # Handle window closing
         self.game_window.protocol("WM_DELETE_WINDOW", self.close)
         
+        # Reusable drop feedback texts
+        self._feedback_hide_job = None
+        self.create_feedback_texts()
+        
+        # Cached label setters for update_display
+        self._lvl_cfg = self.level_label.config
+        self._scr_cfg = self.score_label.config
+        self._acc_cfg = self.accuracy_label.config
+        
         # Show initial instructions
         self.show_initial_instructions()
         
+    def create_feedback_texts(self):
+        """Create the hidden drop feedback texts that are reused for every drop"""
+        self._ok_text = self.canvas.create_text(0, 0, text="✅ Correct!", state='hidden',
+                                                fill='#2ecc71', font=('Arial', 12, 'bold'))
+        self._bad_text = self.canvas.create_text(0, 0, text="❌ Wrong zone!", state='hidden',
+                                                 fill='#e74c3c', font=('Arial', 12, 'bold'))
+    
+    def clear_canvas(self):
+        """Remove every canvas item except the pooled feedback texts"""
+        if self._feedback_hide_job is not None:
+            self.canvas.after_cancel(self._feedback_hide_job)
+            self._feedback_hide_job = None
+        self.canvas.delete("all")
+        self.create_feedback_texts()
+    
+    def show_drop_feedback(self, text_item, x, y):
+        """Show one of the pooled feedback texts above the drop point for a second"""
+        if self._feedback_hide_job is not None:
+            self.canvas.after_cancel(self._feedback_hide_job)
+        self.canvas.itemconfigure(self._ok_text, state='hidden')
+        self.canvas.itemconfigure(self._bad_text, state='hidden')
+        
+        self.canvas.coords(text_item, x, y - 30)
+        self.canvas.itemconfigure(text_item, state='normal')
+        self.canvas.tag_raise(text_item)
+        self._feedback_hide_job = self.canvas.after(1000, self.hide_drop_feedback, text_item)
+    
+    def hide_drop_feedback(self, text_item):
+        """Hide a pooled feedback text"""
+        self._feedback_hide_job = None
+        self.canvas.itemconfigure(text_item, state='hidden')
+    
     def show_initial_instructions(self):
         """Show initial game instructions"""
         self.canvas.create_text(400, 200, 
@@ -282,12 +355,11 @@ class TrainingGame:
         self.start_time = time.time()
         
         self.generate_level()
-        self.game_loop()
         
     def generate_level(self):
         """Generate targets and drop zones for current level"""
-        self.canvas.delete("all")
-        self.targets = []
+        self.clear_canvas()
+        self.targets_by_id = {}
         self.drop_zones = []
         
         # Progressive difficulty
@@ -296,28 +368,39 @@ class TrainingGame:
         
         colors = ['#e74c3c', '#f39c12', '#2ecc71', '#9b59b6', '#1abc9c', '#e67e22']
         
+        # Draw every position up front, keeping items from overlapping
+        half = target_size // 2
+        min_dist = target_size * 1.5
+        target_pos = self.spread_positions((target_size + 10, target_size + 10),
+                                           (800 - target_size - 10, 180),
+                                           num_targets, min_dist)
+        drop_pos = self.spread_positions((target_size + 10, 250),
+                                         (800 - target_size - 10, 380 - target_size),
+                                         num_targets, min_dist)
+        
+        create_oval = self.canvas.create_oval
+        create_rectangle = self.canvas.create_rectangle
+        
         # Generate targets
         for i in range(num_targets):
             # Target position (top half)
-            x = random.randint(target_size + 10, 800 - target_size - 10)
-            y = random.randint(target_size + 10, 180)
+            x, y = target_pos[i]
             
             color = colors[i % len(colors)]
-            target = self.canvas.create_oval(x - target_size//2, y - target_size//2,
-                                           x + target_size//2, y + target_size//2,
-                                           fill=color, outline='white', width=3,
-                                           tags="target")
-            self.targets.append({'id': target, 'color': color, 'size': target_size})
+            target = create_oval(x - half, y - half, x + half, y + half,
+                                 fill=color, outline='white', width=3,
+                                 tags="target")
+            self.targets_by_id[target] = {'color': color, 'half': half}
             
             # Create corresponding drop zone (bottom half)
-            drop_x = random.randint(target_size + 10, 800 - target_size - 10)
-            drop_y = random.randint(250, 380 - target_size)
+            drop_x, drop_y = drop_pos[i]
             
-            drop_zone = self.canvas.create_rectangle(drop_x - target_size//2, drop_y - target_size//2,
-                                                   drop_x + target_size//2, drop_y + target_size//2,
-                                                   fill='gray', outline=color, width=4,
-                                                   stipple='gray50', tags="dropzone")
-            self.drop_zones.append({'id': drop_zone, 'color': color, 'target_id': target})
+            drop_zone = create_rectangle(drop_x - half, drop_y - half,
+                                         drop_x + half, drop_y + half,
+                                         fill='gray', outline=color, width=4,
+                                         stipple='gray50', tags="dropzone")
+            self.drop_zones.append({'id': drop_zone, 'color': color, 'target_id': target,
+                                    'cx': drop_x, 'cy': drop_y, 'half': half})
         
         # Add level instructions
         self.canvas.create_text(400, 30, 
@@ -327,14 +410,32 @@ class TrainingGame:
         # Separator line
         self.canvas.create_line(50, 220, 750, 220, fill='white', width=2, dash=(10, 5))
         
+    def spread_positions(self, low, high, count, min_dist, max_rerolls=20):
+        """Draw count (x, y) positions within [low, high], re-rolling ones closer than min_dist"""
+        low = np.asarray(low)
+        high = np.asarray(high) + 1  # make the upper bounds inclusive
+        positions = self._rng.integers(low, high, size=(count, 2))
+        
+        for _ in range(max_rerolls):
+            dists = np.linalg.norm(positions[:, None] - positions[None, :], axis=-1)
+            np.fill_diagonal(dists, np.inf)
+            crowded = np.flatnonzero((dists < min_dist).any(axis=1))
+            if not len(crowded):
+                break
+            # Re-roll the first crowded item and check again
+            positions[crowded[0]] = self._rng.integers(low, high)
+        
+        return positions.tolist()
+        
     def on_click(self, event):
         """Handle mouse click on canvas"""
         clicked_item = self.canvas.find_closest(event.x, event.y)[0]
         
         # Check if clicked on a target
-        target_ids = [t['id'] for t in self.targets]
-        if clicked_item in target_ids:
+        target = self.targets_by_id.get(clicked_item)
+        if target is not None:
             self.grabbed_target = clicked_item
+            self._grabbed_half = target['half']
             # Highlight grabbed target
             self.canvas.itemconfig(clicked_item, outline='yellow', width=5)
             self.canvas.tag_raise(clicked_item)  # Bring to front
@@ -342,66 +443,51 @@ class TrainingGame:
     def on_drag(self, event):
         """Handle dragging of targets"""
         if self.grabbed_target:
-            # Get target size for proper centering
-            target_size = 15  # Default size
-            for target in self.targets:
-                if target['id'] == self.grabbed_target:
-                    target_size = target['size'] // 2
-                    break
-            
-            # Update target position
-            self.canvas.coords(self.grabbed_target, 
-                             event.x - target_size, event.y - target_size,
-                             event.x + target_size, event.y + target_size)
+            half = self._grabbed_half
+            self.canvas.coords(self.grabbed_target,
+                             event.x - half, event.y - half,
+                             event.x + half, event.y + half)
     
     def on_release(self, event):
         """Handle release of dragged target"""
         if self.grabbed_target:
-            # Find what's under the mouse
-            overlapping = self.canvas.find_overlapping(event.x-10, event.y-10, 
-                                                     event.x+10, event.y+10)
-            
-            target_color = None
-            for target in self.targets:
-                if target['id'] == self.grabbed_target:
-                    target_color = target['color']
-                    break
+            target_color = self.targets_by_id[self.grabbed_target]['color']
             
-            # Check for correct drop
+            # Check for correct drop (zone within 10px of the release point)
             correct_drop = False
             for zone in self.drop_zones:
-                if zone['id'] in overlapping and zone['color'] == target_color:
+                reach = zone['half'] + 10
+                if (zone['color'] == target_color and
+                        abs(event.x - zone['cx']) <= reach and abs(event.y - zone['cy']) <= reach):
                     correct_drop = True
                     # Success animation
-                    self.canvas.create_text(event.x, event.y - 30, text="✅ Correct!", 
-                                          fill='#2ecc71', font=('Arial', 12, 'bold'),
-                                          tags="temp")
-                    self.canvas.after(1000, lambda: self.canvas.delete("temp"))
+                    self.show_drop_feedback(self._ok_text, event.x, event.y)
                     
                     # Remove target and zone
                     self.canvas.delete(self.grabbed_target)
                     self.canvas.delete(zone['id'])
-                    self.targets = [t for t in self.targets if t['id'] != self.grabbed_target]
+                    del self.targets_by_id[self.grabbed_target]
                     self.drop_zones = [z for z in self.drop_zones if z['id'] != zone['id']]
                     self.successful_attempts += 1
                     self.score += 10 * self.current_level
+                    self._display_dirty = True
                     break
             
             if not correct_drop:
                 # Error feedback
-                self.canvas.create_text(event.x, event.y - 30, text="❌ Wrong zone!", 
-                                      fill='#e74c3c', font=('Arial', 12, 'bold'),
-                                      tags="temp")
-                self.canvas.after(1000, lambda: self.canvas.delete("temp"))
+                self.show_drop_feedback(self._bad_text, event.x, event.y)
                 # Reset highlight
                 self.canvas.itemconfig(self.grabbed_target, outline='white', width=3)
             
             self.grabbed_target = None
             self.total_attempts += 1
+            self._display_dirty = True
             
             # Check level completion
-            if not self.targets:
+            if not self.targets_by_id:
                 self.level_completed()
+            
+            self.flush_display()
     
     def level_completed(self):
         """Handle level completion and settings optimization"""
@@ -419,9 +505,9 @@ class TrainingGame:
         # Show completion feedback
         self.show_level_feedback(completion_time, accuracy, performance_score)
         
-        # Update level and UI
+        # Update level (display is flushed by the calling event handler)
         self.current_level += 1
-        self.update_display()
+        self._display_dirty = True
         
         # Enable start button for next level
         self.start_btn.config(state='normal', text='🚀 Next Level')
@@ -430,7 +516,7 @@ class TrainingGame:
     def show_level_feedback(self, time_taken, accuracy, score):
         """Show level completion feedback"""
         # Clear canvas
-        self.canvas.delete("all")
+        self.clear_canvas()
         
         # Celebration message
         messages = ["🎉 Excellent!", "⭐ Great job!", "🚀 Amazing!", "💪 Well done!", "🎯 Perfect!"]
@@ -449,20 +535,22 @@ class TrainingGame:
     
     def apply_feedback(self):
         """Apply user feedback to optimize settings using BFS"""
-        if not self.feedback_var.get():
+        fb = self.feedback_var.get()
+        if not fb:
             return
         
         # Calculate current performance score
-        recent_scores = self.accuracy_scores[-3:] if len(self.accuracy_scores) >= 3 else self.accuracy_scores
-        avg_accuracy = np.mean(recent_scores) if recent_scores else 50
+        recent_scores = self.accuracy_scores
+        avg_accuracy = sum(recent_scores) / len(recent_scores) if recent_scores else 50
         
-        recent_times = self.completion_times[-3:] if len(self.completion_times) >= 3 else self.completion_times
-        avg_time = np.mean(recent_times) if recent_times else 10
+        recent_times = self.completion_times
+        avg_time = sum(recent_times) / len(recent_times) if recent_times else 10
         
         performance_score = avg_accuracy * (50 / max(avg_time, 1))
         
         # Get optimized settings using BFS
-        new_settings = self.optimizer.bfs_optimize(performance_score, self.feedback_var.get())
+        new_state = self.optimizer.bfs_optimize(performance_score, fb)
+        new_settings = self.optimizer.vector_to_settings(new_state)
         
         # Apply new settings to cursor controller
         if hasattr(self.cursor_controller, 'set_adaptive_settings'):
@@ -487,29 +575,31 @@ class TrainingGame:
                            f"• Acceleration: {new_settings['acceleration']:.1f}\n\n" \
                            f"Ready for next level?"
         
-        self.canvas.delete("all")
+        self.clear_canvas()
         self.canvas.create_text(400, 200, text=optimization_text, fill='#f39c12',
                                font=('Arial', 12), justify=tk.CENTER)
         
         # Clear feedback selection
         self.feedback_var.set("")
         
-        print(f"Settings optimized based on feedback: {self.feedback_var.get()}")
+        print(f"Settings optimized based on feedback: {fb}")
     
-    def game_loop(self):
-        """Main game loop"""
-        if self.is_running:
+    def flush_display(self):
+        """Update game display once if any displayed value changed"""
+        if self._display_dirty:
+            self._display_dirty = False
             self.update_display()
-            self.game_window.after(100, self.game_loop)
     
     def update_display(self):
         """Update game display"""
-        self.level_label.config(text=f"Level: {self.current_level}")
-        self.score_label.config(text=f"Score: {self.score}")
+        self._lvl_cfg(text=f"Level: {self.current_level}")
+        self._scr_cfg(text=f"Score: {self.score}")
         
         if self.total_attempts > 0:
             accuracy = (self.successful_attempts / self.total_attempts) * 100
-            self.accuracy_label.config(text=f"Accuracy: {accuracy:.1f}%")
+            self._acc_cfg(text=f"Accuracy: {accuracy:.1f}%")
+        else:
+            self._acc_cfg(text="Accuracy: 0%")
     
     def reset_game(self):
         """Reset the game to initial state"""
@@ -518,10 +608,12 @@ class TrainingGame:
         self.score = 0
         self.total_attempts = 0
         self.successful_attempts = 0
-        self.completion_times = []
-        self.accuracy_scores = []
+        self.completion_times.clear()
+        self.accuracy_scores.clear()
+        self._display_dirty = True
+        self.flush_display()
         
-        self.canvas.delete("all")
+        self.clear_canvas()
         self.start_btn.config(state='normal', text='🚀 Start Training')
         self.feedback_var.set("")
         
@@ -1,19 +1,67 @@
+import logging
+import os
+import sys
+import threading
+import time
 import cv2
 import requests
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Tuple
 
+from cpu_affinity import CAPTURE_CPUS, pin_current_thread
+
+_LOG = logging.getLogger(__name__)
+
+# A grab() that returns faster than this was served from the driver's queue
+# (a stale frame) rather than waiting for the sensor, see _grab_newest()
+_STALE_GRAB_S = 0.005
+_MAX_DRAIN = 4
+
+# Upper bound on opening and reading the DroidCam test capture, so
+# test_droidcam_connection can always wait for its probes to finish
+_PROBE_TIMEOUT_MS = 2000
+
 
 class CameraManager:
     """
     Handles video input from either a local webcam or a DroidCam HTTP stream.
     """
 
-    def __init__(self):
+    def __init__(self, frame_size: Optional[Tuple[int, int]] = None):
+        """
+        ``frame_size`` is an optional (width, height) to request from the
+        camera, so frames are decoded at that size instead of being
+        decoded large and scaled down later. None keeps the camera default.
+        """
         self.cap = None
         self.camera_type = "local"          # "local" or "droidcam"
         self.droidcam_url = ""
         self.is_connected = False
+        self.frame_size = frame_size
+        # What the open capture reads from, ("local", index) or
+        # ("droidcam", ip, port), so callers can reuse a live connection
+        self.source: Optional[tuple] = None
+        # While paused the capture stays open but frames are not decoded
+        self.paused = False
+        # Size of the frames the open capture delivers, (0, 0) if unknown
+        self.frame_width = 0
+        self.frame_height = 0
+        self._gray_buf: Optional[np.ndarray] = None
+
+        # Background reader: newest frame slot shared with get_frame().
+        # Frames live in three recycled buffers: one being written by the
+        # reader, one waiting in _latest and one (_front) owned by the caller.
+        self._latest: Optional[np.ndarray] = None
+        self._front: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Event()   # set while _latest is unread
+        self._stop = threading.Event()
+        # Set when the reader should release its capture on exit; the reader
+        # owns the release so it never happens while a grab() is in flight
+        self._release_cap = threading.Event()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._last_warn = 0.0                   # monotonic time of last frame warning
 
     # ------------------------------------------------------------------ #
     # Local webcam
@@ -21,16 +69,49 @@ class CameraManager:
     def connect_local_camera(self, camera_index: int = 0) -> bool:
         """Connect to a local webcam."""
         try:
-            self.cap = cv2.VideoCapture(camera_index)
+            self.cap = cv2.VideoCapture(camera_index, self._local_backend())
+            if not self.cap.isOpened():
+                # Preferred backend unavailable: let OpenCV pick one
+                self.cap.release()
+                self.cap = cv2.VideoCapture(camera_index)
+
             if self.cap.isOpened():
+                # UVC webcams deliver far higher frame rates as MJPG than raw YUY2
+                self._configure_capture(self.cap, fourcc="MJPG", frame_size=self.frame_size)
                 self.camera_type = "local"
+                self.source = ("local", camera_index)
                 self.is_connected = True
+                self._start_reader()
                 return True
         except Exception as exc:
             print(f"[CameraManager] Error connecting to local camera: {exc}")
 
         return False
 
+    @staticmethod
+    def _local_backend() -> int:
+        """Preferred OpenCV capture backend for local webcams on this platform."""
+        if os.name == "nt":
+            return cv2.CAP_DSHOW
+        if sys.platform.startswith("linux"):
+            return cv2.CAP_V4L2
+        return cv2.CAP_ANY
+
+    @staticmethod
+    def _configure_capture(cap, fourcc: Optional[str] = None,
+                           frame_size: Optional[Tuple[int, int]] = None):
+        """
+        Keep at most one frame queued so read() always returns the newest
+        frame instead of a stale one, and optionally request the decode
+        size. Backends that do not support a property simply ignore it.
+        """
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if frame_size:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, frame_size[0])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, frame_size[1])
+
     # ------------------------------------------------------------------ #
     # DroidCam
     # ------------------------------------------------------------------ #
@@ -39,16 +120,19 @@ class CameraManager:
         Connect to DroidCam using the phone’s IP address.
         Tries several known URL patterns until a valid stream is found.
         """
+        # The MJPEG feed takes its resolution from the URL, not from OpenCV
+        width, height = self.frame_size or (640, 480)
         url_formats = [
             f"http://{ip_address}:{port}/video",
-            f"http://{ip_address}:{port}/mjpegfeed?640x480",
+            f"http://{ip_address}:{port}/mjpegfeed?{width}x{height}",
             f"http://{ip_address}:{port}/webcam/stream",
         ]
 
         for url in url_formats:
             try:
                 print(f"[CameraManager] Trying URL: {url}")
-                self.cap = cv2.VideoCapture(url)
+                self.cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
+                self._configure_capture(self.cap, frame_size=self.frame_size)
 
                 # Grab one frame to test the stream
                 ret, frame = self.cap.read()
@@ -56,7 +140,9 @@ class CameraManager:
                     print(f"[CameraManager] Connected with URL: {url}")
                     self.droidcam_url = url
                     self.camera_type = "droidcam"
+                    self.source = ("droidcam", ip_address, port)
                     self.is_connected = True
+                    self._start_reader(frame)
                     return True
 
                 # Fallback: release and continue to next URL
@@ -71,8 +157,8 @@ class CameraManager:
     def test_droidcam_connection(self, ip_address: str, port: str = "4747") -> bool:
         """
         Quickly verify whether a DroidCam stream is reachable and valid.
-        Performs:
-            1. HTTP status check
+        All URL patterns are probed concurrently; each probe performs:
+            1. HTTP HEAD check (short GET if the server rejects HEAD)
             2. One-frame read through OpenCV
         """
         url_formats = [
@@ -80,61 +166,279 @@ class CameraManager:
             f"http://{ip_address}:{port}/mjpegfeed?640x480",
         ]
 
-        for url in url_formats:
+        # Set once the outcome is known, so slower probes skip their capture
+        done = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(url_formats))
+        try:
+            futures = [executor.submit(self._probe_droidcam_url, url, done)
+                       for url in url_formats]
+            for future in as_completed(futures):
+                if future.result():
+                    return True
+        finally:
+            # DroidCam serves a single client: wait for the other probes to
+            # release their captures before the caller opens the stream
+            done.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return False
+
+    def _probe_droidcam_url(self, url: str, done: threading.Event) -> bool:
+        """
+        Check a single DroidCam URL: cheap HTTP probe, then one frame.
+        The frame read is skipped once ``done`` is set.
+        """
+        try:
+            # 1. HTTP check without transferring the stream body
             try:
-                # 1. Simple HTTP check
-                rsp = requests.get(url, timeout=3, stream=True)
-                if rsp.status_code != 200:
-                    continue
+                status = requests.head(url, timeout=0.5, allow_redirects=False).status_code
+            except requests.RequestException:
+                status = None
+            if status != 200:
+                # Server rejects or mishandles HEAD: open the stream and drop it
+                rsp = requests.get(url, timeout=0.5, stream=True)
+                status = rsp.status_code
+                rsp.close()
+            if status != 200 or done.is_set():
+                return False
 
-                # 2. Can OpenCV read a frame?
-                test_cap = cv2.VideoCapture(url)
+            # 2. Can OpenCV read a frame?
+            test_cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, _PROBE_TIMEOUT_MS,
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, _PROBE_TIMEOUT_MS,
+            ])
+            try:
                 ret, frame = test_cap.read()
+            finally:
                 test_cap.release()
 
-                if ret and frame is not None and frame.size > 0:
-                    print(f"[CameraManager] Connection OK: {url}")
-                    return True
-            except Exception as exc:
-                print(f"[CameraManager] Test failed for {url}: {exc}")
+            if ret and frame is not None and frame.size > 0:
+                print(f"[CameraManager] Connection OK: {url}")
+                return True
+        except Exception as exc:
+            print(f"[CameraManager] Test failed for {url}: {exc}")
 
         return False
 
+    # ------------------------------------------------------------------ #
+    # Pause / resume
+    # ------------------------------------------------------------------ #
+    def pause(self):
+        """
+        Stop delivering frames but keep the capture open, so resume() does
+        not have to reopen the device or renegotiate the DroidCam stream.
+        """
+        self.paused = True
+
+    def resume(self):
+        """Deliver frames again after pause(), starting with a fresh one."""
+        with self._lock:
+            self._frame_ready.clear()
+        self.paused = False
+
+    # ------------------------------------------------------------------ #
+    # Background capture
+    # ------------------------------------------------------------------ #
+    def _start_reader(self, first_frame: Optional[np.ndarray] = None):
+        """Start the daemon thread that keeps the newest frame available."""
+        # A previous reader's capture has been replaced, so it goes with it
+        self._release_cap.set()
+        self._stop_reader()
+        if first_frame is not None:
+            self.frame_height, self.frame_width = first_frame.shape[:2]
+        else:
+            self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # Fresh events per reader: a reader still stuck in a read after
+        # _stop_reader() gave up on it must not be revived by this one
+        self._stop = threading.Event()
+        self._release_cap = threading.Event()
+        self.paused = False
+        with self._lock:
+            self._latest = first_frame
+            self._front = None
+            if first_frame is not None:
+                self._frame_ready.set()
+            else:
+                self._frame_ready.clear()
+
+        self._reader_thread = threading.Thread(
+            target=self._reader, args=(self.cap, self._stop, self._release_cap), daemon=True)
+        self._reader_thread.start()
+        self._bind_fast_get_frame()
+
+    def _stop_reader(self):
+        """
+        Stop the reader thread, waiting up to a second for it to exit. A
+        stalled stream can keep it blocked in grab() for longer; it then exits
+        (and releases its capture, if asked to) once that read returns.
+        """
+        self._stop.set()
+        if self._reader_thread is not None:
+            self._reader_thread.join(timeout=1.0)
+            self._reader_thread = None
+
+    def _reader(self, cap, stop: threading.Event, release_cap: threading.Event):
+        """Continuously read frames so the consumer never waits on decode."""
+        try:
+            self._read_loop(cap, stop)
+        finally:
+            if release_cap.is_set():
+                cap.release()
+
+    def _read_loop(self, cap, stop: threading.Event):
+        """Body of _reader: runs until ``stop`` is set."""
+        pin_current_thread(CAPTURE_CPUS)
+        back = None     # buffer the next frame is decoded into
+        while not stop.is_set():
+            if self.paused:
+                # Keep the stream flowing without decoding, so nothing stale
+                # is queued when capture resumes
+                if not cap.grab():
+                    stop.wait(0.005)
+                continue
+
+            try:
+                ret = self._grab_newest(cap)
+                frame = None
+                if ret:
+                    # Decode into the recycled buffer (allocated on first use)
+                    ret, frame = cap.retrieve(back) if back is not None else cap.retrieve()
+            except Exception as exc:
+                self._warn_throttled("[CameraManager] Error reading frame: %s", exc)
+                ret, frame = False, None
+
+            if ret and frame is not None:
+                with self._lock:
+                    # Publish the frame and recycle the unread/stale one
+                    back, self._latest = self._latest, frame
+                    self._frame_ready.set()
+            else:
+                # Broken or stalled stream: back off instead of spinning
+                stop.wait(0.005)
+
+    @staticmethod
+    def _grab_newest(cap) -> bool:
+        """
+        grab() until the driver queue is empty so only the newest frame gets
+        decoded. Queued frames come back almost instantly while a live one
+        waits for the sensor, so grabbing stops at the first slow grab() (or
+        after _MAX_DRAIN stale frames). Stale frames are never retrieve()d.
+        """
+        for _ in range(_MAX_DRAIN):
+            start = time.perf_counter()
+            if not cap.grab():
+                return False
+            if time.perf_counter() - start > _STALE_GRAB_S:
+                return True
+        return cap.grab()
+
     # ------------------------------------------------------------------ #
     # Frame retrieval
     # ------------------------------------------------------------------ #
-    def get_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+    def get_frame(self, timeout: float = 0.1) -> Tuple[bool, Optional[np.ndarray]]:
         """
-        Return (success_flag, frame).  
-        An empty or invalid frame returns (False, None).
+        Return (success_flag, frame) with the newest captured frame.
+        Waits up to ``timeout`` seconds for a frame that has not been
+        returned before, so callers never process the same frame twice.
+        No new frame, or an empty or invalid one, returns (False, None).
+
+        The returned array is a recycled buffer: it stays valid until the
+        next get_frame() call, so copy it to keep it any longer.
         """
         if not self.is_connected or self.cap is None:
             return False, None
 
         try:
-            ret, frame = self.cap.read()
-            if ret and frame is not None and frame.size > 0:
-                # Basic sanity check
-                if frame.shape[0] > 0 and frame.shape[1] > 0:
+            if self._frame_ready.wait(timeout):
+                with self._lock:
+                    # Take the newest buffer and hand the previous one back
+                    self._front, self._latest = self._latest, self._front
+                    frame = self._front
+                    self._frame_ready.clear()
+
+                if frame is not None and frame.size:
                     return True, frame
 
-            print("[CameraManager] Warning: empty or invalid frame")
+            self._warn_throttled("[CameraManager] Warning: empty or invalid frame")
             return False, None
         except Exception as exc:
-            print(f"[CameraManager] Error reading frame: {exc}")
+            self._warn_throttled("[CameraManager] Error reading frame: %s", exc)
             return False, None
 
+    def get_frame_gray(self, timeout: float = 0.1) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Like get_frame(), but return a single-channel grayscale frame.
+        The conversion writes into a reused buffer, which stays valid until
+        the next get_frame_gray() call.
+        """
+        ret, frame = self.get_frame(timeout)
+        if not ret:
+            return False, None
+
+        if self._gray_buf is None or self._gray_buf.shape != frame.shape[:2]:
+            self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+        return True, self._gray_buf
+
+    def _bind_fast_get_frame(self):
+        """
+        Shadow get_frame() with a version specialised for a running reader.
+        The connection checks and exception guard of the generic method are
+        dropped and everything it needs is captured as closure locals.
+        disconnect() removes the override again.
+        """
+        lock = self._lock
+        wait = self._frame_ready.wait
+        clear = self._frame_ready.clear
+        warn = self._warn_throttled
+
+        def fast_get_frame(timeout: float = 0.1) -> Tuple[bool, Optional[np.ndarray]]:
+            if wait(timeout):
+                with lock:
+                    self._front, self._latest = self._latest, self._front
+                    frame = self._front
+                    clear()
+
+                if frame is not None and frame.size:
+                    return True, frame
+
+            warn("[CameraManager] Warning: empty or invalid frame")
+            return False, None
+
+        fast_get_frame.__doc__ = CameraManager.get_frame.__doc__
+        self.get_frame = fast_get_frame
+
+    def _warn_throttled(self, msg: str, *args):
+        """Log a frame-path warning at most once per second."""
+        now = time.monotonic()
+        if now - self._last_warn > 1.0:
+            self._last_warn = now
+            _LOG.warning(msg, *args)
+
     # ------------------------------------------------------------------ #
     # House-keeping
     # ------------------------------------------------------------------ #
     def disconnect(self):
         """Release the camera and reset state."""
-        if self.cap:
+        self.__dict__.pop("get_frame", None)    # back to the generic get_frame()
+        if self._reader_thread is not None:
+            # The reader releases the capture itself when it exits, so a read
+            # stalled past the join timeout never races with release()
+            self._release_cap.set()
+            self._stop_reader()
+        elif self.cap:
             self.cap.release()
         self.cap = None
         self.is_connected = False
         self.camera_type = "local"
         self.droidcam_url = ""
+        self.source = None
+        self.paused = False
+        self.frame_width = self.frame_height = 0
+        with self._lock:
+            self._latest = self._front = None
+            self._frame_ready.clear()
 
     def get_camera_info(self) -> dict:
         """Return a dict with current camera details."""
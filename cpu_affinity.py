@@ -0,0 +1,54 @@
+"""
+CPU pinning for the pipeline threads.
+
+The camera capture thread and the hand tracking thread are each kept on
+their own cores, so the scheduler does not keep migrating them or let them
+compete with the GUI thread. Linux pins the calling thread with
+os.sched_setaffinity, Windows with SetThreadAffinityMask through ctypes.
+Other platforms (macOS has no affinity API) are left to the scheduler.
+"""
+
+import ctypes
+import os
+import sys
+
+# Cores per pipeline stage, as indices into the CPUs this process may use
+CAPTURE_CPUS = (0,)
+INFERENCE_CPUS = (1, 2)
+
+
+def _available_cpus():
+    """Sorted CPU ids this process is allowed to run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cpu_indices):
+    """Restrict the calling thread to the given CPUs. Indices past the
+    number of usable CPUs are dropped; on a single-CPU machine nothing is
+    pinned. Returns True if the affinity was applied"""
+    available = _available_cpus()
+    cpus = [available[i] for i in cpu_indices if i < len(available)]
+    if not cpus or len(available) < 2:
+        return False
+
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # On Linux pid 0 means the calling thread, not the whole process
+            os.sched_setaffinity(0, cpus)
+            return True
+
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetCurrentThread.restype = ctypes.c_void_p
+            kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+            mask = 0
+            for cpu in cpus:
+                mask |= 1 << cpu
+            return kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), mask) != 0
+    except OSError as e:
+        print(f"Could not pin thread to CPUs {cpus}: {e}")
+
+    return False
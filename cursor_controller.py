@@ -3,31 +3,136 @@ import numpy as np
 import time
 import threading
 from collections import deque
+from jit_utils import njit
+from mouse_input import create_mouse
+
+
+@njit(cache=True, fastmath=True)
+def _clamp(value, lo, hi):
+    """Clamp written as select expressions so LLVM emits min/max, not branches"""
+    value = lo if value < lo else value
+    return hi if value > hi else value
+
+
+# Single-precision signature: every float in the kernel stays float32
+_FRAME_KERNEL_SIG = ("Tuple((float32, float32, int64))(float32, float32, boolean, "
+                     "float32[::1], float32[::1], int64, UniTuple(float32, 5), "
+                     "float32[::1], UniTuple(float32, 11))")
+
+
+@njit(_FRAME_KERNEL_SIG, cache=True, fastmath=True)
+def _frame_kernel(hand_x, hand_y, inverse, hist_x, hist_y, hist_n, weights, motion, consts):
+    """Map one hand position to the next cursor position.
+    
+    Runs margin normalization, the 3-tap jitter filter (hist_x/hist_y are
+    shift registers, oldest first), velocity smoothing, acceleration and the
+    screen clamp in one pass. hist_x, hist_y and motion
+    ([prev_x, prev_y, velocity_x, velocity_y]) are updated in place.
+    Returns (final_x, final_y, hist_n).
+    """
+    (margin_x, margin_y, inv_eff_w, inv_eff_h, sx_sens, sy_sens, max_x, max_y,
+     velocity_smoothing, acceleration, accel_threshold_sq) = consts
+    w0, w1, w2, v1, v2 = weights
+    zero = np.float32(0.0)
+    one = np.float32(1.0)
+    
+    # Normalize with margins for stability and map to screen coordinates
+    norm_x = _clamp((hand_x - margin_x) * inv_eff_w, zero, one)
+    norm_y = _clamp((hand_y - margin_y) * inv_eff_h, zero, one)
+    if inverse:
+        norm_x = one - norm_x
+        norm_y = one - norm_y
+    target_x = norm_x * sx_sens
+    target_y = norm_y * sy_sens
+    
+    # Anti-jitter filter
+    hist_x[0] = hist_x[1]
+    hist_x[1] = hist_x[2]
+    hist_x[2] = target_x
+    hist_y[0] = hist_y[1]
+    hist_y[1] = hist_y[2]
+    hist_y[2] = target_y
+    if hist_n < 3:
+        hist_n += 1
+    if hist_n == 1:
+        filtered_x, filtered_y = target_x, target_y
+    elif hist_n == 2:
+        filtered_x = v1 * hist_x[1] + v2 * target_x
+        filtered_y = v1 * hist_y[1] + v2 * target_y
+    else:
+        filtered_x = w0 * hist_x[0] + w1 * hist_x[1] + w2 * target_x
+        filtered_y = w0 * hist_y[0] + w1 * hist_y[1] + w2 * target_y
+    
+    prev_x, prev_y, velocity_x, velocity_y = motion[0], motion[1], motion[2], motion[3]
+    
+    # Initialize if first run
+    if prev_x == zero and prev_y == zero:
+        motion[0] = filtered_x
+        motion[1] = filtered_y
+        return filtered_x, filtered_y, hist_n
+    
+    # Velocity smoothing
+    smooth_velocity_x = (velocity_x * velocity_smoothing +
+                         (filtered_x - prev_x) * (one - velocity_smoothing))
+    smooth_velocity_y = (velocity_y * velocity_smoothing +
+                         (filtered_y - prev_y) * (one - velocity_smoothing))
+    
+    # Apply acceleration for significant movements
+    if (smooth_velocity_x * smooth_velocity_x +
+            smooth_velocity_y * smooth_velocity_y) > accel_threshold_sq:
+        smooth_velocity_x *= acceleration
+        smooth_velocity_y *= acceleration
+    
+    # Clamp to screen bounds
+    final_x = _clamp(prev_x + smooth_velocity_x, zero, max_x)
+    final_y = _clamp(prev_y + smooth_velocity_y, zero, max_y)
+    
+    motion[0] = final_x
+    motion[1] = final_y
+    motion[2] = smooth_velocity_x
+    motion[3] = smooth_velocity_y
+    return final_x, final_y, hist_n
+
 
 class CursorController:
     def __init__(self):
         pyautogui.FAILSAFE = True
         pyautogui.PAUSE = 0
         self.screen_width, self.screen_height = pyautogui.size()
+        self.mouse = create_mouse(self.screen_width, self.screen_height)
         
         # Movement settings with anti-jitter
         self.smoothing_factor = 0.2
-        self.acceleration_factor = 1.2
         self.velocity_smoothing = 0.15
         
         # Enhanced movement tracking
-        self.prev_x, self.prev_y = 0, 0
-        self.velocity_x, self.velocity_y = 0, 0
+        # [prev_x, prev_y, velocity_x, velocity_y], single precision is plenty
+        # for screen pixels and _frame_kernel updates it in place
+        self._motion = np.zeros(4, dtype=np.float32)
         self.movement_threshold = 3
-        self.max_velocity = 80
-        self.prediction_factor = 0.2
-        self.jitter_filter_size = 3
-        self.position_history = deque(maxlen=self.jitter_filter_size)
+        self._move_thresh_sq = self.movement_threshold ** 2
+        
+        # Last position sent to the OS (tracked here instead of querying it)
+        self._committed_x = self._committed_y = float('-inf')
+        
+        # Anti-jitter 3-tap shift registers (oldest first) and the number of
+        # samples seen since the last reset
+        self._hist_x = np.zeros(3, dtype=np.float32)
+        self._hist_y = np.zeros(3, dtype=np.float32)
+        self._hist_n = 0
+        
+        # Normalized filter weights, oldest to newest, for a full register
+        # (w0, w1, w2) followed by the two-sample warm-up (v1, v2)
+        w3 = np.linspace(0.3, 1.0, 3)
+        w2 = np.linspace(0.3, 1.0, 2)
+        self._jitter_weights = tuple(np.float32(w) for w in np.concatenate((w3 / w3.sum(),
+                                                                         w2 / w2.sum())))
         
         # Cursor control toggle system
         self.cursor_enabled = True  # Cursor movement enabled by default
-        self.last_fist_time = 0
-        self.fist_double_click_window = 1.0  # 1 second window for double fist
+        # All gate timestamps are time.monotonic_ns() values and windows are in ns
+        self.last_fist_time_ns = 0
+        self.fist_double_click_window_ns = 1_000_000_000  # 1 second window for double fist
         self.fist_count = 0
         
         # Adaptive settings
@@ -38,17 +143,36 @@ class CursorController:
         
         # Click and hold state
         self.is_holding = False
-        self.last_click_time = 0
-        self.click_cooldown = 0.15
-        self.hold_start_time = 0
-        self.hold_threshold = 0.3
+        self.last_click_time_ns = 0
+        self.click_cooldown_ns = 150_000_000
+        self.hold_start_time_ns = 0
+        self.hold_threshold_ns = 300_000_000
         
         # Scroll settings
-        self.last_scroll_time = 0
-        self.scroll_cooldown = 0.1
+        self.last_scroll_time_ns = 0
+        self.scroll_cooldown_ns = 100_000_000
+        
+        # Margins (px), screen size and tuning passed to _frame_kernel
+        self.margin_x, self.margin_y = 40.0, 40.0
+        self.accel_threshold = 15.0
+        self._cache_frame_dims(640, 480)
+        
+        # Compile the mapping kernel now so the first tracked frame isn't delayed
+        _frame_kernel(320.0, 240.0, False, np.zeros(3, dtype=np.float32),
+                      np.zeros(3, dtype=np.float32), 0, self._jitter_weights,
+                      np.zeros(4, dtype=np.float32), self._kernel_consts)
         
-        # Performance tracking
-        self.movement_history = deque(maxlen=50)
+        # All mouse output is issued from one worker thread, so events reach
+        # the OS in order and the backends' reused buffers are only touched
+        # by that thread. move_cursor only posts the latest target (newer
+        # targets overwrite ones not yet sent); button and scroll events are
+        # queued behind any move posted before them (see _post_mouse_event)
+        self._pending_pos = None
+        self._mouse_events = deque()
+        self._mouse_lock = threading.Lock()
+        self._mouse_ev = threading.Event()
+        self._mouse_thread = threading.Thread(target=self._mouse_worker, daemon=True)
+        self._mouse_thread.start()
         
     def toggle_cursor_movement(self):
         """Toggle cursor movement on/off"""
@@ -59,10 +183,10 @@ class CursorController:
     
     def handle_fist_toggle(self):
         """Handle double fist gesture for cursor toggle"""
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
         
         # Check if this fist is within the double-click window
-        if current_time - self.last_fist_time < self.fist_double_click_window:
+        if now_ns - self.last_fist_time_ns < self.fist_double_click_window_ns:
             self.fist_count += 1
             if self.fist_count >= 2:
                 # Double fist detected - toggle cursor
@@ -73,7 +197,7 @@ class CursorController:
             # Reset count if too much time passed
             self.fist_count = 1
         
-        self.last_fist_time = current_time
+        self.last_fist_time_ns = now_ns
         return False  # No toggle occurred
     
     def set_adaptive_settings(self, sensitivity, smoothing, acceleration):
@@ -82,180 +206,147 @@ class CursorController:
         self.adaptive_smoothing = max(0.1, min(0.8, smoothing))
         self.adaptive_acceleration = max(1.0, min(3.0, acceleration))
         self.smoothing_factor = self.adaptive_smoothing
+        self.update_kernel_consts()
         print(f"Settings updated: S={sensitivity:.2f}, Sm={smoothing:.2f}, A={acceleration:.2f}")
     
     def set_cursor_inversion(self, invert):
         """Set cursor movement inversion"""
         self.inverse_cursor = invert
         
-    def apply_jitter_filter(self, x, y):
-        """Apply anti-jitter filtering"""
-        self.position_history.append((x, y))
-        
-        if len(self.position_history) < 2:
-            return x, y
-        
-        weights = np.linspace(0.3, 1.0, len(self.position_history))
-        weights = weights / np.sum(weights)
-        
-        filtered_x = sum(pos[0] * weight for pos, weight in zip(self.position_history, weights))
-        filtered_y = sum(pos[1] * weight for pos, weight in zip(self.position_history, weights))
-        
-        return filtered_x, filtered_y
+    def update_kernel_consts(self):
+        """Pack the mapping constants for _frame_kernel (call after changing them)"""
+        self._kernel_consts = tuple(np.float32(value) for value in (
+            self.margin_x, self.margin_y,
+            1.0 / (self._cached_fw - 2 * self.margin_x),
+            1.0 / (self._cached_fh - 2 * self.margin_y),
+            self.screen_width * self.adaptive_sensitivity,
+            self.screen_height * self.adaptive_sensitivity,
+            self.screen_width - 1, self.screen_height - 1,
+            self.velocity_smoothing, self.adaptive_acceleration,
+            self.accel_threshold * self.accel_threshold))
+    
+    def _cache_frame_dims(self, frame_width, frame_height):
+        """Remember the camera frame size and refresh the constants derived from it"""
+        self._cached_fw, self._cached_fh = frame_width, frame_height
+        self.update_kernel_consts()
     
     def map_coordinates(self, hand_x, hand_y, frame_width, frame_height):
         """Enhanced coordinate mapping with toggle support"""
         if not self.cursor_enabled:
-            return int(self.prev_x), int(self.prev_y)  # Return last position if disabled
-        
-        start_time = time.time()
-        
-        # Enhanced margins for stability
-        margin_x, margin_y = 40, 40
-        effective_width = frame_width - (2 * margin_x)
-        effective_height = frame_height - (2 * margin_y)
-        
-        # Normalize with margins
-        norm_x = np.clip((hand_x - margin_x) / effective_width, 0, 1)
-        norm_y = np.clip((hand_y - margin_y) / effective_height, 0, 1)
-        
-        # Apply inversion
-        if self.inverse_cursor:
-            norm_x = 1 - norm_x
-            norm_y = 1 - norm_y
-        
-        # Map to screen coordinates
-        target_x = norm_x * self.screen_width * self.adaptive_sensitivity
-        target_y = norm_y * self.screen_height * self.adaptive_sensitivity
-        
-        # Apply jitter filter
-        filtered_x, filtered_y = self.apply_jitter_filter(target_x, target_y)
-        
-        # Initialize if first run
-        if self.prev_x == 0 and self.prev_y == 0:
-            self.prev_x, self.prev_y = filtered_x, filtered_y
-            return int(filtered_x), int(filtered_y)
-        
-        # Calculate smooth velocity
-        velocity_x = filtered_x - self.prev_x
-        velocity_y = filtered_y - self.prev_y
-        
-        # Apply velocity smoothing
-        smooth_velocity_x = (self.velocity_x * self.velocity_smoothing + 
-                           velocity_x * (1 - self.velocity_smoothing))
-        smooth_velocity_y = (self.velocity_y * self.velocity_smoothing + 
-                           velocity_y * (1 - self.velocity_smoothing))
+            return int(self._motion[0]), int(self._motion[1])  # Return last position if disabled
         
-        # Apply acceleration for significant movements
-        velocity_magnitude = np.sqrt(smooth_velocity_x**2 + smooth_velocity_y**2)
-        if velocity_magnitude > 15:
-            smooth_velocity_x *= self.adaptive_acceleration
-            smooth_velocity_y *= self.adaptive_acceleration
+        if frame_width != self._cached_fw or frame_height != self._cached_fh:
+            self._cache_frame_dims(frame_width, frame_height)
         
-        # Calculate final position
-        final_x = self.prev_x + smooth_velocity_x
-        final_y = self.prev_y + smooth_velocity_y
-        
-        # Clamp to screen bounds
-        final_x = max(0, min(self.screen_width - 1, final_x))
-        final_y = max(0, min(self.screen_height - 1, final_y))
-        
-        # Update tracking variables
-        self.velocity_x = smooth_velocity_x
-        self.velocity_y = smooth_velocity_y
-        self.prev_x, self.prev_y = final_x, final_y
+        final_x, final_y, self._hist_n = _frame_kernel(
+            float(hand_x), float(hand_y), bool(self.inverse_cursor),
+            self._hist_x, self._hist_y, self._hist_n,
+            self._jitter_weights, self._motion, self._kernel_consts)
         
         return int(final_x), int(final_y)
     
     def move_cursor(self, x, y):
-        """Move cursor only if enabled"""
+        """Move cursor only if enabled (the move is sent by the mouse worker)"""
         if not self.cursor_enabled:
             return
+        
+        dx = x - self._committed_x
+        dy = y - self._committed_y
+        if dx * dx + dy * dy > self._move_thresh_sq:
+            self._committed_x, self._committed_y = x, y
+            with self._mouse_lock:
+                self._pending_pos = (x, y)
+            self._mouse_ev.set()
+    
+    def _post_mouse_event(self, action, args, error_label):
+        """Queue a button/scroll call for the mouse worker, after the move
+        that was pending when it was requested"""
+        with self._mouse_lock:
+            if self._pending_pos is not None:
+                self._mouse_events.append((self.mouse.move_to, self._pending_pos,
+                                           "Cursor movement error"))
+                self._pending_pos = None
+            self._mouse_events.append((action, args, error_label))
+        self._mouse_ev.set()
+    
+    def _mouse_worker(self):
+        """Send queued mouse events in order, then the latest cursor position"""
+        events = self._mouse_events
+        while True:
+            self._mouse_ev.wait()
+            self._mouse_ev.clear()
             
-        try:
-            current_x, current_y = pyautogui.position()
-            distance = np.sqrt((x - current_x)**2 + (y - current_y)**2)
-            if distance > self.movement_threshold:
-                pyautogui.moveTo(x, y, duration=0, _pause=False)
-        except Exception as e:
-            print(f"Cursor movement error: {e}")
+            while True:
+                with self._mouse_lock:
+                    if events:
+                        action, args, error_label = events.popleft()
+                    elif self._pending_pos is not None:
+                        action, args = self.mouse.move_to, self._pending_pos
+                        error_label = "Cursor movement error"
+                        self._pending_pos = None
+                    else:
+                        break
+                
+                try:
+                    action(*args)
+                except Exception as e:
+                    print(f"{error_label}: {e}")
     
     def handle_pinch_gesture(self, is_pinch_active):
         """Enhanced pinch handling"""
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
         
         if is_pinch_active:
             if not self.is_holding:
-                if self.hold_start_time == 0:
-                    self.hold_start_time = current_time
-                elif current_time - self.hold_start_time > self.hold_threshold:
-                    try:
-                        pyautogui.mouseDown(_pause=False)
-                        self.is_holding = True
-                        print("Started holding (drag mode)")
-                    except Exception as e:
-                        print(f"Hold start error: {e}")
+                if self.hold_start_time_ns == 0:
+                    self.hold_start_time_ns = now_ns
+                elif now_ns - self.hold_start_time_ns > self.hold_threshold_ns:
+                    self._post_mouse_event(self.mouse.press, (), "Hold start error")
+                    self.is_holding = True
+                    print("Started holding (drag mode)")
         else:
             if self.is_holding:
-                try:
-                    pyautogui.mouseUp(_pause=False)
-                    self.is_holding = False
-                    print("Released hold")
-                except Exception as e:
-                    print(f"Hold release error: {e}")
-            elif self.hold_start_time > 0:
-                hold_duration = current_time - self.hold_start_time
-                if hold_duration < self.hold_threshold and current_time - self.last_click_time > self.click_cooldown:
-                    try:
-                        pyautogui.click(_pause=False)
-                        self.last_click_time = current_time
-                        print("Quick click")
-                    except Exception as e:
-                        print(f"Click error: {e}")
-            self.hold_start_time = 0
+                self._post_mouse_event(self.mouse.release, (), "Hold release error")
+                self.is_holding = False
+                print("Released hold")
+            elif self.hold_start_time_ns > 0:
+                hold_duration_ns = now_ns - self.hold_start_time_ns
+                if hold_duration_ns < self.hold_threshold_ns and now_ns - self.last_click_time_ns > self.click_cooldown_ns:
+                    self._post_mouse_event(self.mouse.click, (), "Click error")
+                    self.last_click_time_ns = now_ns
+                    print("Quick click")
+            self.hold_start_time_ns = 0
     
     def click(self):
         """Perform regular left click"""
-        current_time = time.time()
-        if current_time - self.last_click_time > self.click_cooldown:
-            try:
-                pyautogui.click(_pause=False)
-                self.last_click_time = current_time
-            except Exception as e:
-                print(f"Click error: {e}")
+        now_ns = time.monotonic_ns()
+        if now_ns - self.last_click_time_ns > self.click_cooldown_ns:
+            self._post_mouse_event(self.mouse.click, (), "Click error")
+            self.last_click_time_ns = now_ns
     
     def right_click(self):
         """Perform right click"""
-        current_time = time.time()
-        if current_time - self.last_click_time > self.click_cooldown:
-            try:
-                pyautogui.rightClick(_pause=False)
-                self.last_click_time = current_time
-            except Exception as e:
-                print(f"Right click error: {e}")
+        now_ns = time.monotonic_ns()
+        if now_ns - self.last_click_time_ns > self.click_cooldown_ns:
+            self._post_mouse_event(self.mouse.click, ("right",), "Right click error")
+            self.last_click_time_ns = now_ns
     
     def scroll(self, direction):
         """Enhanced scrolling"""
-        current_time = time.time()
-        if current_time - self.last_scroll_time > self.scroll_cooldown:
-            try:
-                if direction == "up":
-                    pyautogui.scroll(3, _pause=False)
-                elif direction == "down":
-                    pyautogui.scroll(-3, _pause=False)
-                self.last_scroll_time = current_time
-            except Exception as e:
-                print(f"Scroll error: {e}")
+        now_ns = time.monotonic_ns()
+        if now_ns - self.last_scroll_time_ns > self.scroll_cooldown_ns:
+            if direction == "up":
+                self._post_mouse_event(self.mouse.scroll, (3,), "Scroll error")
+            elif direction == "down":
+                self._post_mouse_event(self.mouse.scroll, (-3,), "Scroll error")
+            self.last_scroll_time_ns = now_ns
     
     def double_click(self):
         """Perform double click"""
-        current_time = time.time()
-        if current_time - self.last_click_time > self.click_cooldown:
-            try:
-                pyautogui.doubleClick(_pause=False)
-                self.last_click_time = current_time
-            except Exception as e:
-                print(f"Double click error: {e}")
+        now_ns = time.monotonic_ns()
+        if now_ns - self.last_click_time_ns > self.click_cooldown_ns:
+            self._post_mouse_event(self.mouse.click, ("left", 2), "Double click error")
+            self.last_click_time_ns = now_ns
     
     def key_press(self, key):
         """Press a keyboard key"""
@@ -274,14 +365,9 @@ class CursorController:
     def reset_state(self):
         """Reset controller state"""
         if self.is_holding:
-            try:
-                pyautogui.mouseUp(_pause=False)
-            except:
-                pass
+            self._post_mouse_event(self.mouse.release, (), "Hold release error")
         self.is_holding = False
-        self.hold_start_time = 0
-        self.position_history.clear()
-        self.movement_history.clear()
-        self.velocity_x = self.velocity_y = 0
-        self.prev_x = self.prev_y = 0
+        self.hold_start_time_ns = 0
+        self._hist_n = 0
+        self._motion[:] = 0.0
         self.fist_count = 0
@@ -1,7 +1,40 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
 import os
+import sys
+from functools import partial
+
+# orjson is optional; the stdlib json module is used when it is missing
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+    
+    _loads = json.loads
+
+# Tkinter is only needed by the assignment window, so it is imported on first use
+tk = ttk = messagebox = None
+
+
+def _import_tkinter():
+    """Bind the module-level tk/ttk/messagebox names"""
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as tkinter_ttk, messagebox as tkinter_messagebox
+        tk, ttk, messagebox = tkinter, tkinter_ttk, tkinter_messagebox
+
+
+def _noop():
+    """Action handled elsewhere (or deliberately nothing)"""
+    pass
+
 
 class GestureManager:
     """Manages custom gesture assignments and actions"""
@@ -10,6 +43,23 @@ class GestureManager:
         self.cursor_controller = cursor_controller
         self.settings_file = "gesture_settings.json"
         
+        # Action name -> builder(params) returning a zero-argument callable with
+        # the params already bound; cursor_move and click_hold are handled by
+        # the main tracking loop and pinch gesture logic
+        cc = cursor_controller
+        self._action_builders = {
+            "cursor_move": lambda p: _noop,
+            "left_click": lambda p: cc.click,
+            "right_click": lambda p: cc.right_click,
+            "double_click": lambda p: cc.double_click,
+            "click_hold": lambda p: _noop,
+            "scroll_up": lambda p: partial(cc.scroll, "up"),
+            "scroll_down": lambda p: partial(cc.scroll, "down"),
+            "key_press": lambda p: partial(cc.key_press, p.get("key", "space")),
+            "key_combo": lambda p: partial(cc.key_combination, *p.get("keys", ["ctrl", "c"])),
+            "no_action": lambda p: _noop,
+        }
+        
         # Default gesture assignments
         self.default_actions = {
             "point": {"action": "cursor_move", "params": {}},
@@ -33,68 +83,70 @@ class GestureManager:
             "no_action": "No Action"
         }
         
-        # Current gesture assignments
+        # Current gesture assignments and their last saved serialization
+        self._saved_bytes = None
         self.gesture_actions = self.load_settings()
+        self._rebuild_gesture_callables()
         
     def load_settings(self):
         """Load gesture settings from file"""
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    return json.load(f)
+            with open(self.settings_file, 'rb') as f:
+                data = _loads(f.read())
+            self._saved_bytes = _dumps(data)
+            return self.intern_actions(data)
+        except FileNotFoundError:
             return self.default_actions.copy()
         except Exception as e:
             print(f"Error loading settings: {e}")
             return self.default_actions.copy()
     
+    @staticmethod
+    def intern_actions(data):
+        """Intern gesture/action names and param keys loaded from JSON so
+        per-frame dict lookups on them hit the identity fast path"""
+        interned = {}
+        for gesture, config in data.items():
+            config["action"] = sys.intern(config["action"])
+            config["params"] = {sys.intern(k): v for k, v in config.get("params", {}).items()}
+            interned[sys.intern(gesture)] = config
+        return interned
+    
     def save_settings(self):
         """Save gesture settings to file"""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.gesture_actions, f, indent=2)
+            data = _dumps(self.gesture_actions)
+            if data == self._saved_bytes:
+                print("Gesture settings unchanged")
+                return
+            
+            # Write a temp file and swap it in so a crash never leaves a partial file
+            tmp_file = self.settings_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.settings_file)
+            self._saved_bytes = data
             print("Gesture settings saved")
         except Exception as e:
             print(f"Error saving settings: {e}")
     
+    def _rebuild_gesture_callables(self):
+        """Pre-bind one callable per gesture from the current assignments"""
+        self._gesture_cbs = {}
+        for gesture, action_config in self.gesture_actions.items():
+            builder = self._action_builders.get(action_config["action"], lambda p: _noop)
+            self._gesture_cbs[gesture] = builder(action_config.get("params", {}))
+    
     def execute_gesture_action(self, gesture, landmarks=None):
         """Execute the assigned action for a gesture"""
-        if gesture not in self.gesture_actions:
-            return
-        
-        action_config = self.gesture_actions[gesture]
-        action = action_config["action"]
-        params = action_config.get("params", {})
-        
         try:
-            if action == "cursor_move":
-                # This is handled by the main tracking loop
-                pass
-            elif action == "left_click":
-                self.cursor_controller.click()
-            elif action == "right_click":
-                self.cursor_controller.right_click()
-            elif action == "double_click":
-                self.cursor_controller.double_click()
-            elif action == "click_hold":
-                # This is handled by pinch gesture logic
-                pass
-            elif action == "scroll_up":
-                self.cursor_controller.scroll("up")
-            elif action == "scroll_down":
-                self.cursor_controller.scroll("down")
-            elif action == "key_press":
-                key = params.get("key", "space")
-                self.cursor_controller.key_press(key)
-            elif action == "key_combo":
-                keys = params.get("keys", ["ctrl", "c"])
-                self.cursor_controller.key_combination(*keys)
-            elif action == "no_action":
-                pass
+            self._gesture_cbs.get(gesture, _noop)()
         except Exception as e:
-            print(f"Error executing action {action}: {e}")
+            print(f"Error executing action for {gesture}: {e}")
     
     def open_assignment_window(self, parent):
         """Open gesture assignment window"""
+        _import_tkinter()
         self.assignment_window = tk.Toplevel(parent)
         self.assignment_window.title("Gesture Assignment Settings")
         self.assignment_window.geometry("600x500")
@@ -233,6 +285,7 @@ class GestureManager:
                 "params": params
             }
         
+        self._rebuild_gesture_callables()
         self.save_settings()
         messagebox.showinfo("Settings Saved", "Gesture assignments have been saved!")
         self.assignment_window.destroy()
@@ -241,6 +294,7 @@ class GestureManager:
         """Reset to default gesture assignments"""
         if messagebox.askyesno("Reset Settings", "Reset all gestures to default assignments?"):
             self.gesture_actions = self.default_actions.copy()
+            self._rebuild_gesture_callables()
             self.save_settings()
             messagebox.showinfo("Reset Complete", "Gesture assignments reset to default!")
             self.assignment_window.destroy()
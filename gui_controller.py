@@ -1,17 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import cv2
+import numpy as np
 from PIL import Image, ImageTk
+from collections import deque
 import threading
 import time
 from camera_manager import CameraManager
+from cpu_affinity import INFERENCE_CPUS, pin_current_thread
 
 
 class GUIController:
     def __init__(self, hand_tracker, cursor_controller):
         self.hand_tracker = hand_tracker
         self.cursor_controller = cursor_controller
-        self.camera_manager = CameraManager()
+        # Ask the camera for the preview size so frames rarely need resizing
+        self.camera_manager = CameraManager(frame_size=(640, 480))
         
         self.root = tk.Tk()
         self.root.title("Hand Cursor Control - Professional Edition")
@@ -38,10 +42,84 @@ class GUIController:
         self.is_running = False
         self.video_thread = None
         self.current_gesture = "none"
+        # Tells process_video to exit (set by stop_tracking / window close)
+        self._stop_event = threading.Event()
+        
+        # Pipeline: the camera reader thread captures (keeping only the newest
+        # frame), process_video runs tracking and hands the newest annotated
+        # frame to the Tk thread through display_frames. Both hand-offs hold
+        # a single frame, so a slow stage drops frames instead of queueing them
+        self.display_frames = deque(maxlen=1)
+        self._display_job = None
+        # The preview is drawn at ~30 FPS; cursor and gesture handling still
+        # run on every captured frame
+        self.preview_interval_ms = 33
+        
+        # Per-frame widget state written by process_video and applied by the
+        # Tk thread in _flush_ui_state (Tk widgets must not be touched from
+        # the worker); each key holds only the latest value
+        self._ui_state = {}
+        self._ui_job = None
+        # Last texts applied to the labels, so unchanged values skip config()
+        self._last_gesture_text = None
+        self._last_status_text = None
+        self._last_fps_text = None
+        
+        # perf_counter() timestamps of the last processed frames; the FPS
+        # label is computed from this window once a second
+        self._frame_times = deque(maxlen=60)
+        self._next_fps_update = 0.0
+        
+        # Frame-diff gating: while no hand is in view, hand detection is
+        # skipped as long as a 32x24 grayscale thumbnail stays within this mean
+        # absolute difference (per pixel) of the last frame that was actually
+        # run through the tracker. A visible hand is detected on every frame,
+        # since small finger moves barely change a whole-frame mean
+        self.frame_diff_threshold = 2.0
+        
+        # While pointing, MediaPipe runs on every detect_interval-th changed
+        # frame; the cursor finger tip is followed with optical flow on a
+        # grayscale window in between (HandTracker.track_roi)
+        self.detect_interval = 3
+        
+        # Persistent preview image (created in create_center_panel), kept
+        # across Stop/Start and recreated only if the display size changes
+        self._photo = None
+        self._photo_size = None
+        self._photo_shown = False
+        # 4-byte RGBA staging buffer and the PIL image it is loaded into,
+        # both sized with the preview image (see _make_preview_image)
+        self._rgba_buf = None
+        self._rgba_image = None
+        # Reused target for frames that still need resizing for the preview
+        self._resize_buf = None
+        # Preview frames that need resizing are resized and converted through
+        # OpenCL (T-API) when a device is available
+        self._use_opencl = cv2.ocl.haveOpenCL()
+        
+        # Gesture -> (action taking the landmarks, (overlay text, status text, color))
+        primary = self.colors['primary']
+        self._gesture_table = {
+            "pinch": (self._do_pinch, ("🤏 Pinch (Click/Hold)", "Pinch", primary)),
+            "point": (self._do_point, ("👆 Point (Move Cursor)", "Point", primary)),
+            "fist": (self._do_fist, ("✊ Fist (Click)", "Fist", primary)),
+            "peace": (self._do_peace, ("✌️ Peace (Right Click)", "Peace", primary)),
+            "open_hand": (self._do_open_hand, ("🖐️ Open Hand (Scroll)", "Open Hand", primary)),
+        }
         
         self.setup_styles()
         self.setup_gui()
         
+        # Only annotate frames with the hand skeleton while the preview can
+        # be seen; minimizing the window turns drawing off
+        self.root.bind('<Map>', self._on_visibility_change, add='+')
+        self.root.bind('<Unmap>', self._on_visibility_change, add='+')
+        
+    def _on_visibility_change(self, event):
+        """Follow the main window being shown/minimized"""
+        if event.widget is self.root:
+            self.hand_tracker.set_draw_preview(event.type == tk.EventType.Map)
+    
     def setup_styles(self):
         """Configure ttk styles with fallback compatibility"""
         self.style = ttk.Style()
@@ -258,6 +336,13 @@ class GUIController:
         self.smoothing_label.grid(row=0, column=1, padx=(10, 0))
         
         self.smoothing_scale.configure(command=self.update_smoothing_label)
+        
+        # Mirror the slider values into plain floats for process_video, so
+        # the worker thread never reads Tk variables
+        self._sens = self.sensitivity_var.get()
+        self._smooth = self.smoothing_var.get()
+        self.sensitivity_var.trace_add('write', self._on_sensitivity_write)
+        self.smoothing_var.trace_add('write', self._on_smoothing_write)
 
     def toggle_cursor_inversion(self):
         """Toggle cursor movement inversion"""
@@ -328,6 +413,9 @@ class GUIController:
                                    height=20)
         self.video_label.pack(padx=10, pady=10)
         
+        # One Tk image for the whole session; frames are pasted into it
+        self._make_preview_image(640, 480)
+        
         # Gesture overlay
         self.gesture_overlay = tk.Label(center_frame, text="", 
                                        font=('Arial', 14, 'bold'),
@@ -397,6 +485,14 @@ class GUIController:
         """Update sensitivity label"""
         self.sensitivity_label.config(text=f"{float(value):.1f}")
         
+    def _on_sensitivity_write(self, *args):
+        """Cache the sensitivity slider value when it changes"""
+        self._sens = self.sensitivity_var.get()
+        
+    def _on_smoothing_write(self, *args):
+        """Cache the smoothing slider value when it changes"""
+        self._smooth = self.smoothing_var.get()
+        
     def update_smoothing_label(self, value):
         """Update smoothing label"""
         self.smoothing_label.config(text=f"{float(value):.1f}")
@@ -450,8 +546,18 @@ class GUIController:
     def start_tracking(self):
         """Start hand tracking with improved error handling"""
         try:
-            # Connect to camera
+            # Connect to camera, or resume the capture kept open by Stop when
+            # the same source is selected again
+            camera = self.camera_manager
             if self.camera_type_var.get() == "local":
+                wanted = ("local", 0)
+            else:
+                wanted = ("droidcam", self.ip_entry.get().strip(), self.port_entry.get().strip())
+            
+            if camera.is_connected and camera.source == wanted:
+                camera.resume()
+            elif self.camera_type_var.get() == "local":
+                camera.disconnect()
                 success = self.camera_manager.connect_local_camera()
                 if not success:
                     messagebox.showerror("Error", "Could not connect to local camera")
@@ -464,6 +570,7 @@ class GUIController:
                     messagebox.showerror("Error", "Please enter phone IP address")
                     return
                 
+                camera.disconnect()
                 success = self.camera_manager.connect_droidcam(ip, port)
                 if not success:
                     messagebox.showerror("Error", 
@@ -491,8 +598,15 @@ class GUIController:
                                               foreground=self.colors['success'])
             
             # Start processing
+            self.hand_tracker.set_draw_preview(self.root.state() != 'iconic')
+            self.display_frames.clear()
+            self._ui_state.clear()
+            self._frame_times.clear()
+            self._stop_event.clear()
             self.video_thread = threading.Thread(target=self.process_video, daemon=True)
             self.video_thread.start()
+            self._display_job = self.root.after(self.preview_interval_ms, self._drain_display)
+            self._ui_job = self.root.after(50, self._flush_ui_state)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start tracking: {str(e)}")
@@ -500,7 +614,20 @@ class GUIController:
     def stop_tracking(self):
         """Stop hand tracking"""
         self.is_running = False
-        self.camera_manager.disconnect()
+        self._stop_event.set()
+        if self._display_job is not None:
+            self.root.after_cancel(self._display_job)
+            self._display_job = None
+        if self._ui_job is not None:
+            self.root.after_cancel(self._ui_job)
+            self._ui_job = None
+        if self.video_thread is not None:
+            self.video_thread.join(timeout=1.0)
+            self.video_thread = None
+        self.display_frames.clear()
+        self._ui_state.clear()
+        # Keep the capture open so the next Start is instant
+        self.camera_manager.pause()
         
         # Update UI
         self.start_btn.config(state="normal")
@@ -512,119 +639,237 @@ class GUIController:
         
         # Reset status labels
         self.status_labels["System"].config(text="Ready", foreground="black")
-        self.status_labels["Camera"].config(text="Not Connected", foreground="gray")
+        self.status_labels["Camera"].config(text="Paused", foreground="gray")
         self.status_labels["Gesture"].config(text="None", foreground="gray")
         self.status_labels["Tracking"].config(text="Inactive", foreground="gray")
         
-        # Clear video
+        # Clear video (the preview image itself is kept for the next start)
+        self._photo_shown = False
         self.video_label.config(image="", 
                                text="📹\n\nCamera Preview\nWill Appear Here\n\nSelect camera and click Start")
         self.gesture_overlay.config(text="")
         self.fps_label.config(text="FPS: --")
+        self._last_gesture_text = None
+        self._last_status_text = None
+        self._last_fps_text = None
     
     def process_video(self):
         """Enhanced video processing with improved finger switching"""
-        fps_counter = 0
-        fps_start_time = time.time()
-        last_frame_time = time.time()
-        
-        while self.is_running:
-            ret, frame = self.camera_manager.get_frame()
+        # Keep tracking on its own cores, apart from the capture thread
+        pin_current_thread(INFERENCE_CPUS)
+        
+        # Thumbnail and tracker results of the last frame sent to detection
+        ref_small = None
+        results = None
+        hand_present = False
+        diff_limit = self.frame_diff_threshold * 32 * 24
+        
+        # Cursor finger tip followed by optical flow, and how many frames it
+        # has been tracked that way since the last full detection
+        tracked_tip = None
+        tracked_frames = 0
+        max_tracked = self.detect_interval - 1
+        
+        # Bind hot-path lookups once instead of resolving them every frame
+        tracker = self.hand_tracker
+        cursor = self.cursor_controller
+        get_frame = self.camera_manager.get_frame
+        find_hands = tracker.find_hands
+        get_landmarks = tracker.get_landmarks
+        track_roi = tracker.track_roi
+        set_roi_reference = tracker.set_roi_reference
+        poll_hands = tracker.poll_hands
+        follow_tip = tracker.follow_tip
+        detect_gestures = tracker.detect_gestures
+        get_cursor_pos = tracker.get_cursor_finger_position
+        map_coordinates = cursor.map_coordinates
+        move_cursor = cursor.move_cursor
+        handle_pinch = cursor.handle_pinch_gesture
+        publish = self.display_frames.append
+        ui_state = self._ui_state
+        gesture_table = self._gesture_table
+        secondary = self.colors['secondary']
+        flip, resize, cvt_color = cv2.flip, cv2.resize, cv2.cvtColor
+        absdiff, sum_elems = cv2.absdiff, cv2.sumElems
+        stamp_frame = self._frame_times.append
+        now = time.perf_counter
+        
+        # Capture size is fixed while the camera is open; frames are only
+        # re-measured if the width ever disagrees
+        width = self.camera_manager.frame_width
+        height = self.camera_manager.frame_height
+        
+        # The mirrored frame is written into a small ring of reused buffers.
+        # A zero-copy frame[:, ::-1] view would not do: OpenCV drawing and
+        # the preview conversion need contiguous pixels, and the camera recycles
+        # its buffer on the next get_frame(). Three slots keep the frame the
+        # Tk thread may still be pasting clear of the one being written.
+        flip_bufs = [None, None, None]
+        flip_slot = 0
+        
+        stop_requested = self._stop_event.is_set
+        
+        while not stop_requested():
+            # Blocks until the camera delivers a new frame, which paces the loop
+            ret, frame = get_frame()
             if not ret or frame is None:
-                time.sleep(0.005)
                 continue
             
-            # Frame rate control
-            current_time = time.time()
-            frame_delta = current_time - last_frame_time
-            target_fps = 60
-            target_frame_time = 1.0 / target_fps
-            
-            if frame_delta < target_frame_time:
-                time.sleep(target_frame_time - frame_delta)
-            
-            last_frame_time = time.time()
-            
             # Update settings
-            self.cursor_controller.smoothing_factor = self.smoothing_var.get()
+            cursor.smoothing_factor = self._smooth
             
             # Process frame
-            frame = cv2.flip(frame, 1)
-            height, width, _ = frame.shape
+            if frame.shape[1] != width:
+                height, width = frame.shape[:2]
+            buf = flip_bufs[flip_slot]
+            if buf is None or buf.shape != frame.shape:
+                buf = flip_bufs[flip_slot] = np.empty_like(frame)
+            frame = flip(frame, 1, dst=buf)
+            flip_slot = (flip_slot + 1) % 3
+            
+            # Re-run detection while a hand is in view or once the scene has
+            # changed noticeably; otherwise reuse the previous results
+            gray = cvt_color(frame, cv2.COLOR_BGR2GRAY)
+            small = resize(gray, (32, 24), interpolation=cv2.INTER_AREA)
+            changed = (hand_present or ref_small is None or
+                       sum_elems(absdiff(small, ref_small))[0] >= diff_limit)
             
             try:
-                results = self.hand_tracker.find_hands(frame)
-                landmarks = self.hand_tracker.get_landmarks(frame, results)
+                # Between detections a pointing hand only needs its cursor
+                # finger tip, which optical flow follows far more cheaply
+                tip = None
+                if tracked_tip is not None and tracked_frames < max_tracked:
+                    tip = track_roi(gray, tracked_tip) if changed else tracked_tip
+                
+                if tip is not None:
+                    if changed:
+                        tracked_frames += 1
+                        ref_small = small
+                    tracked_tip = tip
+                    follow_tip(frame, tip)
+                    x, y = map_coordinates(tip[0], tip[1], width, height)
+                    move_cursor(x, y)
+                    publish(frame)
+                    stamp_frame(now())
+                    continue
                 
-                if landmarks and len(landmarks) >= 21:
-                    gesture = self.hand_tracker.detect_gestures(landmarks)
-                    cursor_pos = self.hand_tracker.get_cursor_finger_position(landmarks)
+                # Full detection; also forced once tracking ends or loses the
+                # tip so the cursor never falls back to stale landmarks
+                if changed or tracked_tip is not None:
+                    results = find_hands(frame)
+                    ref_small = small
+                    set_roi_reference(gray)
+                    tracked_frames = 0
+                else:
+                    # Async detection finishes after the frame was submitted,
+                    # so a hand found just before the scene went still is
+                    # only picked up here
+                    polled = poll_hands()
+                    if polled is not None:
+                        results = polled
+                tracked_tip = None
+                landmarks = get_landmarks(frame, results)
+                hand_present = len(landmarks) >= 21
+                
+                if hand_present:
+                    gesture = detect_gestures(landmarks)
+                    cursor_pos = get_cursor_pos(landmarks)
                     
                     if cursor_pos['valid'] and cursor_pos['stability'] > 0.4:
-                        sensitivity = self.sensitivity_var.get()
-                        x, y = self.cursor_controller.map_coordinates(
+                        sensitivity = self._sens
+                        x, y = map_coordinates(
                             cursor_pos['x'], cursor_pos['y'], width, height
                         )
-                        self.cursor_controller.move_cursor(x, y)
+                        move_cursor(x, y)
+                        if gesture == "point":
+                            tracked_tip = (cursor_pos['x'], cursor_pos['y'])
                     
                     # Handle gestures
-                    if gesture == "pinch":
-                        is_pinch = self.hand_tracker.is_pinch_active(landmarks)
-                        self.cursor_controller.handle_pinch_gesture(is_pinch)
-                        self.gesture_overlay.config(text="🤏 Pinch (Click/Hold)")
-                        self.status_labels["Gesture"].config(text="Pinch", foreground=self.colors['primary'])
-                    
-                    elif gesture == "point":
-                        self.cursor_controller.handle_pinch_gesture(False)
-                        self.gesture_overlay.config(text="👆 Point (Move Cursor)")
-                        self.status_labels["Gesture"].config(text="Point", foreground=self.colors['primary'])
-                    
-                    elif gesture == "fist":
-                        self.cursor_controller.handle_pinch_gesture(False)
-                        self.cursor_controller.click()
-                        self.gesture_overlay.config(text="✊ Fist (Click)")
-                        self.status_labels["Gesture"].config(text="Fist", foreground=self.colors['primary'])
-                    
-                    elif gesture == "peace":
-                        self.cursor_controller.handle_pinch_gesture(False)
-                        self.cursor_controller.right_click()
-                        self.gesture_overlay.config(text="✌️ Peace (Right Click)")
-                        self.status_labels["Gesture"].config(text="Peace", foreground=self.colors['primary'])
-                    
-                    elif gesture == "open_hand":
-                        self.cursor_controller.handle_pinch_gesture(False)
-                        self.cursor_controller.scroll("up")
-                        self.gesture_overlay.config(text="🖐️ Open Hand (Scroll)")
-                        self.status_labels["Gesture"].config(text="Open Hand", foreground=self.colors['primary'])
-                    
+                    entry = gesture_table.get(gesture)
+                    if entry is not None:
+                        action, ui_text = entry
+                        action(landmarks)
+                        ui_state["gesture"] = ui_text
                     else:
-                        self.cursor_controller.handle_pinch_gesture(False)
-                        self.gesture_overlay.config(text=f"🎯 {gesture.replace('_', ' ').title()}")
-                        self.status_labels["Gesture"].config(text=gesture.title(), foreground=self.colors['secondary'])
+                        handle_pinch(False)
+                        ui_state["gesture"] = (f"🎯 {gesture.replace('_', ' ').title()}", gesture.title(), secondary)
                 
                 else:
-                    self.cursor_controller.handle_pinch_gesture(False)
-                    self.gesture_overlay.config(text="🤚 Show your hand")
-                    self.status_labels["Gesture"].config(text="No Hand", foreground="orange")
+                    handle_pinch(False)
+                    ui_state["gesture"] = ("🤚 Show your hand", "No Hand", "orange")
                     
             except Exception as e:
                 print(f"Hand tracking error: {e}")
-                self.gesture_overlay.config(text="❌ Tracking Error")
-                self.cursor_controller.handle_pinch_gesture(False)
-            
-            # Update video display
-            self.update_video_display(frame)
+                ui_state["gesture"] = ("❌ Tracking Error", None, None)
+                handle_pinch(False)
             
-            # Calculate FPS
-            fps_counter += 1
-            if fps_counter % 30 == 0:
-                current_time = time.time()
-                fps = 30 / (current_time - fps_start_time)
-                self.fps_label.config(text=f"FPS: {fps:.1f}")
-                fps_start_time = current_time
-            
-            time.sleep(0.001)
+            # Hand the frame to the Tk thread for display
+            publish(frame)
+            stamp_frame(now())
 
+    def _do_pinch(self, landmarks):
+        """Pinch: click/hold while the pinch is active"""
+        self.cursor_controller.handle_pinch_gesture(self.hand_tracker.is_pinch_active(landmarks))
+    
+    def _do_point(self, landmarks):
+        """Point: cursor movement only"""
+        self.cursor_controller.handle_pinch_gesture(False)
+    
+    def _do_fist(self, landmarks):
+        """Fist: left click"""
+        self.cursor_controller.handle_pinch_gesture(False)
+        self.cursor_controller.click()
+    
+    def _do_peace(self, landmarks):
+        """Peace: right click"""
+        self.cursor_controller.handle_pinch_gesture(False)
+        self.cursor_controller.right_click()
+    
+    def _do_open_hand(self, landmarks):
+        """Open hand: scroll up"""
+        self.cursor_controller.handle_pinch_gesture(False)
+        self.cursor_controller.scroll("up")
+    
+    def _drain_display(self):
+        """Tk-thread display stage: show the newest processed frame, if any
+        (runs every preview_interval_ms, frames in between are dropped)"""
+        try:
+            frame = self.display_frames.pop()
+        except IndexError:
+            pass
+        else:
+            self.update_video_display(frame)
+        
+        if self.is_running:
+            self._display_job = self.root.after(self.preview_interval_ms, self._drain_display)
+    
+    def _flush_ui_state(self):
+        """Tk-thread UI stage: apply the latest gesture and FPS state (20 Hz)"""
+        state = self._ui_state
+        gesture = state.pop("gesture", None)
+        if gesture is not None:
+            overlay_text, status_text, color = gesture
+            if overlay_text != self._last_gesture_text:
+                self.gesture_overlay.config(text=overlay_text)
+                self._last_gesture_text = overlay_text
+            if status_text is not None and (status_text, color) != self._last_status_text:
+                self.status_labels["Gesture"].config(text=status_text, foreground=color)
+                self._last_status_text = (status_text, color)
+        
+        # FPS over the timestamp window, shown once a second
+        current_time = time.perf_counter()
+        times = self._frame_times
+        if current_time >= self._next_fps_update and len(times) >= 2:
+            self._next_fps_update = current_time + 1.0
+            span = times[-1] - times[0]
+            fps_text = f"FPS: {(len(times) - 1) / span:.1f}" if span > 0 else "FPS: --"
+            if fps_text != self._last_fps_text:
+                self.fps_label.config(text=fps_text)
+                self._last_fps_text = fps_text
+        
+        if self.is_running:
+            self._ui_job = self.root.after(50, self._flush_ui_state)
+    
     def update_video_display(self, frame):
         """Update video display with proper centering"""
         try:
@@ -640,20 +885,55 @@ class GUIController:
                 new_height = display_height
                 new_width = int(display_height * aspect_ratio)
             
-            display_frame = cv2.resize(frame, (new_width, new_height))
-            
-            # Convert to RGB
-            rgb_frame = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(rgb_frame)
-            photo = ImageTk.PhotoImage(pil_image)
+            # Recreate the Tk image only when the size changes and attach it
+            # to the label once; later frames just paste into it
+            if self._photo_size != (new_width, new_height):
+                self._make_preview_image(new_width, new_height)
+            if not self._photo_shown:
+                self.video_label.config(image=self._photo, text="",
+                                        width=new_width, height=new_height)
+                self._photo_shown = True
             
-            # Update display
-            self.video_label.config(image=photo, text="", width=new_width, height=new_height)
-            self.video_label.image = photo
+            # Expand BGR to 4-byte RGBA (Pillow's native pixel layout, so
+            # loading it is a straight copy), then paste into the Tk image
+            rgba = None
+            if (h, w) != (new_height, new_width) and self._use_opencl:
+                try:
+                    # Resize and conversion both run on the OpenCL device:
+                    # one upload, one download of the finished RGBA pixels
+                    rgba = cv2.cvtColor(
+                        cv2.resize(cv2.UMat(frame), (new_width, new_height),
+                                   interpolation=cv2.INTER_NEAREST),
+                        cv2.COLOR_BGR2RGBA).get()
+                except cv2.error as e:
+                    print(f"OpenCL preview failed ({e}), using CPU")
+                    self._use_opencl = False
+            if rgba is None:
+                if (h, w) != (new_height, new_width):
+                    frame = self._resize_cpu(frame, new_width, new_height)
+                rgba = cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_BGR2RGBA,
+                                    dst=self._rgba_buf)
+            self._rgba_image.frombytes(rgba)
+            self._photo.paste(self._rgba_image)
             
         except Exception as e:
             print(f"Display error: {e}")
     
+    def _make_preview_image(self, width, height):
+        """(Re)create the Tk preview image and its RGBA staging buffers"""
+        self._photo = ImageTk.PhotoImage("RGBA", (width, height))
+        self._photo_size = (width, height)
+        self._photo_shown = False
+        self._rgba_buf = np.empty((height, width, 4), np.uint8)
+        self._rgba_image = Image.new("RGBA", (width, height))
+    
+    def _resize_cpu(self, frame, width, height):
+        """Resize a frame for the preview into the reused CPU buffer"""
+        if self._resize_buf is None or self._resize_buf.shape[:2] != (height, width):
+            self._resize_buf = np.empty((height, width, 3), np.uint8)
+        return cv2.resize(frame, (width, height), dst=self._resize_buf,
+                          interpolation=cv2.INTER_NEAREST)
+    
     def show_help(self):
         """Show help dialog with training game information"""
         help_text = """
@@ -715,6 +995,8 @@ For DroidCam setup, ensure both devices are on the same network.
         """Handle window closing with training game cleanup"""
         if self.is_running:
             self.stop_tracking()
+        self.camera_manager.disconnect()
+        self.hand_tracker.close()
         
         # Close training game if open
         self.close_training_game()
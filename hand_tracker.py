@@ -1,35 +1,266 @@
+import os
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
 import math
+import threading
 import time  # ← Missing import added
+from jit_utils import njit
+
+# Hand Landmarker model for the MediaPipe Tasks API, downloaded from
+# https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task
+# Without it the legacy mp.solutions.hands pipeline (CPU only) is used.
+HAND_LANDMARKER_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     "hand_landmarker.task")
+
+# Returned by get_landmarks when no hand is visible
+_NO_LANDMARKS = np.empty((0, 2), dtype=np.int32)
+
+# Gesture codes returned by _classify_gesture
+_GESTURE_NAMES = ("other", "point", "peace", "fist", "open_hand")
+_GESTURE_POINT = 1
+
+# Hand skeleton drawing style (BGR colors), built once instead of per frame
+_CONNECTION_COLOR = (255, 0, 0)
+_CONNECTION_THICKNESS = 2
+_JOINT_OUTLINE_COLOR = (255, 255, 255)
+_JOINT_OUTLINE_RADIUS = 4
+_JOINT_COLOR = (0, 255, 0)
+_JOINT_RADIUS = 3
+_JOINT_THICKNESS = 2
+_CURSOR_HIGHLIGHT_COLOR = (0, 255, 255)  # Yellow
+_CURSOR_HIGHLIGHT_RADIUS = 8
+
+
+# Numeric kernels on the (21, 2) int32 landmark array of (x, y) rows.
+# The HandTracker methods below are thin wrappers around them.
+
+@njit(cache=True, fastmath=True)
+def _fingers_up(lm, up):
+    """Fill up[0..4] with the thumb..pinky up/down states"""
+    # Thumb: tip further from the wrist than the IP joint (squared distances
+    # order the same way, so no sqrt is needed)
+    dx = lm[4, 0] - lm[0, 0]
+    dy = lm[4, 1] - lm[0, 1]
+    tip_dist_sq = dx * dx + dy * dy
+    dx = lm[3, 0] - lm[0, 0]
+    dy = lm[3, 1] - lm[0, 1]
+    up[0] = tip_dist_sq > dx * dx + dy * dy
+    
+    # Other fingers: tip above PIP
+    up[1] = lm[8, 1] < lm[6, 1]
+    up[2] = lm[12, 1] < lm[10, 1]
+    up[3] = lm[16, 1] < lm[14, 1]
+    up[4] = lm[20, 1] < lm[18, 1]
+
+
+@njit(cache=True, fastmath=True)
+def _classify_gesture(lm, up, cursor_idx, others):
+    """Gesture code (index into _GESTURE_NAMES) for a non-pinching hand.
+    cursor_idx is 1 for the index finger, 4 for the pinky; others holds
+    the remaining non-thumb fingers"""
+    _fingers_up(lm, up)
+    total = 0
+    for i in range(5):
+        if up[i]:
+            total += 1
+    
+    # Point: only the cursor finger (and optionally the thumb) is up
+    if up[cursor_idx]:
+        others_up = False
+        for i in others:
+            if up[i]:
+                others_up = True
+        if not others_up:
+            return 1
+    
+    # Peace sign - index and middle
+    if up[1] and up[2] and not up[3] and not up[4]:
+        return 2
+    
+    # Fist - all down
+    if total <= 1:
+        return 3
+    
+    # Open hand - most fingers up
+    if total >= 4:
+        return 4
+    
+    return 0
+
+
+@njit(cache=True, fastmath=True)
+def _pinch_distance_sq(lm):
+    """Squared thumb tip (4) to index tip (8) distance in pixels"""
+    dx = lm[4, 0] - lm[8, 0]
+    dy = lm[4, 1] - lm[8, 1]
+    return dx * dx + dy * dy
+
+
+@njit(cache=True, fastmath=True)
+def _cursor_finger_metrics(lm, tip_id, pip_id, mcp_id):
+    """Return (valid, stability) for the cursor finger"""
+    dx = lm[tip_id, 0] - lm[mcp_id, 0]
+    dy = lm[tip_id, 1] - lm[mcp_id, 1]
+    finger_length = math.hypot(dx, dy)
+    length_stability = min(finger_length / 80.0, 1.0)
+    
+    # Check if finger is extended
+    extension_stability = 1.0 if lm[tip_id, 1] < lm[pip_id, 1] else 0.3
+    
+    stability = (length_stability + extension_stability) / 2.0
+    return finger_length > 20.0 and stability > 0.4, stability
+
+
 
 class HandTracker:
-    def __init__(self):
+    def __init__(self, model_path=HAND_LANDMARKER_MODEL, model_complexity=0, use_opencl=False):
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+        
+        # Landmark annotation is only drawn while a preview is on screen
+        # (see set_draw_preview); connections as an (n, 2) index array
+        self.draw_preview = False
+        self._connections = np.array(sorted(self.mp_hands.HAND_CONNECTIONS), dtype=np.intp)
+        
+        # Prefer the Tasks HandLandmarker (GPU delegate, then CPU); fall back
+        # to the legacy Hands solution if the model or Tasks API is missing.
+        # model_complexity only applies to the legacy solution: 0 is the Lite
+        # landmark network (about twice as fast on CPU), 1 the full one.
+        # The landmarker runs asynchronously (LIVE_STREAM): _on_result keeps
+        # the newest (hands, timestamp, gray frame) result, and each pending
+        # timestamp holds the crop its image came from and its gray frame
+        self._latest_result = self._returned_result = ([], 0, None)
+        self._pending = {}
+        self._result_lock = threading.Lock()
+        self._last_timestamp_ms = 0
+        self.landmarker = self._create_landmarker(model_path)
+        if self.landmarker is None:
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=1,
+                model_complexity=model_complexity,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.6
+            )
         
         # Landmark indices
         self.tip_ids = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
         self.pip_ids = [3, 6, 10, 14, 18]
         self.mcp_ids = [2, 5, 9, 13, 17]
+        self._tip_idx = np.array(self.tip_ids, dtype=np.intp)
+        # Scratch array for the finger-up kernel
+        self._fingers_buf = np.empty(5, dtype=np.bool_)
+        # Non-thumb fingers other than the cursor finger, per cursor finger,
+        # which must all be down for a point gesture
+        self._other_index = np.array([2, 3, 4], dtype=np.intp)
+        self._other_pinky = np.array([1, 2, 3], dtype=np.intp)
         
         # Cursor control finger (can switch between index and pinky)
         self.cursor_finger = 'index'  # 'index' or 'pinky'
         
         # Gesture stability
-        self.gesture_history = []
-        self.history_size = 5
-        self.pinch_history = []
+        # The pinch history is a fixed-size ring buffer: slot index plus fill count
         self.pinch_stability_count = 3
-        self.pinch_threshold = 40
+        self.pinch_history = np.zeros(self.pinch_stability_count, dtype=np.uint8)
+        self._pinch_idx = 0
+        self._pinch_filled = 0
+        self.set_pinch_threshold(40)
+        
+        # Inference pyramid: MediaPipe gets a small copy of each frame while
+        # the caller keeps the full one for drawing and preview. Landmarks
+        # come back normalized, so get_landmarks scales them to the full frame
+        self.inference_size = (256, 192)
+        
+        # Temporal locality: once a hand is found, the next detection only
+        # looks at a square around its last bounding box grown crop_scale
+        # times, in full frame pixels as (x0, y0, x1, y1); None searches the
+        # whole frame. Crops are resized to crop_inference_size, so the hand
+        # reaches MediaPipe at a fixed, higher resolution
+        self.crop_scale = 1.5
+        self.crop_inference_size = (192, 192)
+        self._last_bbox = None
+        
+        # With use_opencl (and an OpenCL device) the downscale and color
+        # conversion run through OpenCV's T-API, so only the small RGB image
+        # comes back from the GPU. Off by default: for small inputs the
+        # upload can cost more than it saves
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        
+        # Reused [resized, RGB] buffers for the MediaPipe input, one pair for
+        # whole frames and one for crops, so alternating between the two
+        # never reallocates (a pair only changes if its input size does)
+        self._frame_bufs = [None, None]
+        self._crop_bufs = [None, None]
+        
+        # Landmarks of the current frame as (x, y) pixel rows, row i being
+        # landmark i. get_landmarks refills this array, so it is only valid
+        # until the next call
+        self._lm = np.empty((21, 2), dtype=np.int32)
+        
+        # Optical-flow tracking of the cursor finger tip between detections
+        # (track_roi): window size, pyramidal Lucas-Kanade settings and the
+        # largest per-pixel match error still accepted as the same point
+        self.roi_size = 64
+        self.roi_max_error = 10.0
+        self._lk_params = dict(
+            winSize=(15, 15), maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        self._roi_gray = None
+        self._roi_point = np.empty((1, 1, 2), dtype=np.float32)
+        
+        # Compile the numeric kernels now rather than on the first hand seen
+        self._warm_up_kernels()
+        
+    def _warm_up_kernels(self):
+        """Run each kernel once on dummy data so JIT compilation happens at startup"""
+        dummy = np.zeros((21, 2), dtype=np.int32)
+        _classify_gesture(dummy, self._fingers_buf, 1, self._other_index)
+        _pinch_distance_sq(dummy)
+        _cursor_finger_metrics(dummy, 8, 6, 5)
+    
+    def _create_landmarker(self, model_path):
+        """Create a LIVE_STREAM HandLandmarker, trying the GPU delegate first"""
+        if not os.path.exists(model_path):
+            print(f"Hand landmarker model not found ({model_path}), using legacy MediaPipe Hands")
+            return None
+        
+        try:
+            from mediapipe.tasks.python import BaseOptions, vision
+        except ImportError as e:
+            print(f"MediaPipe Tasks unavailable ({e}), using legacy MediaPipe Hands")
+            return None
+        
+        for delegate in (BaseOptions.Delegate.GPU, BaseOptions.Delegate.CPU):
+            try:
+                options = vision.HandLandmarkerOptions(
+                    base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+                    running_mode=vision.RunningMode.LIVE_STREAM,
+                    num_hands=1,
+                    min_hand_detection_confidence=0.7,
+                    min_hand_presence_confidence=0.5,
+                    min_tracking_confidence=0.6,
+                    result_callback=self._on_result
+                )
+                landmarker = vision.HandLandmarker.create_from_options(options)
+                print(f"Hand landmarker running on {delegate.name}")
+                return landmarker
+            except Exception as e:
+                print(f"Hand landmarker {delegate.name} delegate failed: {e}")
         
+        print("Using legacy MediaPipe Hands")
+        return None
+    
+    def set_draw_preview(self, enabled):
+        """Enable or disable drawing the hand skeleton onto tracked frames"""
+        self.draw_preview = bool(enabled)
+    
+    def set_pinch_threshold(self, threshold):
+        """Pinch distance threshold in pixels (compared squared, without a sqrt)"""
+        self.pinch_threshold = threshold
+        self._pinch_threshold_sq = threshold * threshold
+    
     def set_cursor_finger(self, finger_type):
         """Set which finger to use for cursor control"""
         if finger_type in ['index', 'pinky']:
@@ -37,276 +268,375 @@ class HandTracker:
             print(f"Cursor control switched to {finger_type} finger")
     
     def find_hands(self, frame):
-        """Detect hands with improved processing"""
+        """Detect hands; returns a list of NormalizedLandmarkList (one per hand).
+        With the Tasks landmarker this submits the frame and returns the newest
+        finished result, which may belong to an earlier frame"""
         try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
-            return results
+            # Search around the last known hand first, whole frame on a miss
+            height, width = frame.shape[:2]
+            bbox = self._last_bbox
+            if bbox is not None:
+                x0, y0, x1, y1 = bbox
+                crop = (x0 / width, y0 / height, (x1 - x0) / width, (y1 - y0) / height)
+                hands = self._detect(frame[y0:y1, x0:x1], self.crop_inference_size, crop)
+                # An async miss is only known after the fact, so the full
+                # frame is searched from the next call on instead of now
+                if hands or self.landmarker is not None:
+                    if not hands:
+                        self._last_bbox = None
+                    return hands
+                self._last_bbox = None
+            
+            size = self.inference_size if width > self.inference_size[0] else None
+            return self._detect(frame, size, None)
         except Exception as e:
             print(f"Hand detection error: {e}")
             return None
     
-    def get_landmarks(self, frame, results):
-        """Extract hand landmarks with better visualization"""
-        landmarks = []
-        if results and results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                try:
-                    # Draw landmarks with better visibility
-                    self.mp_drawing.draw_landmarks(
-                        frame, 
-                        hand_landmarks, 
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
-                        self.mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
-                    )
+    @staticmethod
+    def _map_from_crop(hands, crop):
+        """Map crop-normalized landmarks back to the full frame, crop being
+        its (x, y, width, height) as fractions of the frame"""
+        ox, oy, sx, sy = crop
+        for hand in hands:
+            for landmark in hand.landmark:
+                landmark.x = ox + landmark.x * sx
+                landmark.y = oy + landmark.y * sy
+        return hands
+    
+    def _detect(self, image, size, crop):
+        """Run MediaPipe on image (the frame, or the crop of it described by
+        crop), resized to size (width, height) or as is if size is None"""
+        if size is not None and image.shape[1::-1] == size:
+            size = None
+        # Shrinking averages pixels; small crops are enlarged smoothly
+        interpolation = (cv2.INTER_AREA if size is not None and size[0] < image.shape[1]
+                         else cv2.INTER_LINEAR)
+        
+        if self.use_opencl:
+            try:
+                gpu_image = cv2.UMat(image)
+                if size is not None:
+                    gpu_image = cv2.resize(gpu_image, size, interpolation=interpolation)
+                rgb_frame = cv2.cvtColor(gpu_image, cv2.COLOR_BGR2RGB).get()
+            except cv2.error as e:
+                print(f"OpenCL preprocessing failed ({e}), using CPU")
+                self.use_opencl = False
+            else:
+                rgb_frame.flags.writeable = False
+                return self._run_model(rgb_frame, crop)
+        
+        # Resize before color conversion so both run on the small image
+        bufs = self._crop_bufs if crop else self._frame_bufs
+        if size is not None:
+            if bufs[0] is None or bufs[0].shape[1::-1] != size:
+                bufs[0] = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            image = cv2.resize(image, size, dst=bufs[0], interpolation=interpolation)
+        
+        if bufs[1] is None or bufs[1].shape != image.shape:
+            bufs[1] = np.empty_like(image)
+        rgb_frame = bufs[1]
+        rgb_frame.flags.writeable = True
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        # A read-only array is passed to MediaPipe by reference, not copied
+        rgb_frame.flags.writeable = False
+        return self._run_model(rgb_frame, crop)
+    
+    def _run_model(self, rgb_frame, crop):
+        """Full-frame hand landmarks for a read-only RGB image, from whichever
+        MediaPipe pipeline is in use"""
+        if self.landmarker is None:
+            results = self.hands.process(rgb_frame)
+            hands = list(results.multi_hand_landmarks or [])
+            return self._map_from_crop(hands, crop) if crop and hands else hands
+        
+        # LIVE_STREAM mode needs strictly increasing timestamps, which also
+        # tie each result back to the crop its image was cut from
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        with self._result_lock:
+            self._pending[timestamp_ms] = [crop, None]
+        
+        # The reused RGB buffer is overwritten by the next frame while this
+        # one may still be in flight, so the async call gets its own copy
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame.copy())
+        self.landmarker.detect_async(mp_image, timestamp_ms)
+        self._returned_result = self._latest_result
+        return self._returned_result[0]
+    
+    def _on_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback (MediaPipe thread): cache the newest hands"""
+        with self._result_lock:
+            crop, gray = self._pending.pop(timestamp_ms, (None, None))
+            # Frames MediaPipe dropped while busy never get a callback
+            for stale in [t for t in self._pending if t < timestamp_ms]:
+                del self._pending[stale]
+        
+        # Same landmark container the legacy pipeline returns, so drawing
+        # and extraction work unchanged
+        hands = [landmark_pb2.NormalizedLandmarkList(landmark=[
+                     landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand])
+                 for hand in result.hand_landmarks]
+        if crop and hands:
+            hands = self._map_from_crop(hands, crop)
+        with self._result_lock:
+            self._latest_result = (hands, timestamp_ms, gray)
+    
+    def get_landmarks(self, frame, hands):
+        """Extract hand landmarks with better visualization.
+        Returns a (21, 2) int32 array of (x, y) rows, or an empty array
+        when no hand is visible"""
+        landmarks = _NO_LANDMARKS
+        if hands:
+            try:
+                # Extract positions (single hand tracked, the first one wins)
+                # One bulk copy of the normalized coordinates, then a single
+                # vectorized scale and truncating cast into the reused array
+                height, width, _ = frame.shape
+                xy = np.fromiter((v for landmark in hands[0].landmark
+                                  for v in (landmark.x, landmark.y)),
+                                 dtype=np.float64, count=42).reshape(21, 2)
+                lm = self._lm
+                np.multiply(xy, (width, height), out=lm, casting='unsafe')
+                landmarks = lm
+                self._update_bbox(lm, width, height)
+                
+                if self.draw_preview:
+                    self._draw_hand(frame, lm)
                     
-                    # Extract positions
-                    height, width, _ = frame.shape
-                    for id, landmark in enumerate(hand_landmarks.landmark):
-                        x, y = int(landmark.x * width), int(landmark.y * height)
-                        landmarks.append([id, x, y])
-                        
-                        # Highlight cursor control finger
-                        cursor_id = 8 if self.cursor_finger == 'index' else 20
-                        if id == cursor_id:
-                            cv2.circle(frame, (x, y), 8, (0, 255, 255), -1)  # Yellow highlight
-                            
-                except Exception as e:
-                    print(f"Landmark extraction error: {e}")
-                    continue
+            except Exception as e:
+                print(f"Landmark extraction error: {e}")
         
         return landmarks
     
-    def get_finger_positions(self, landmarks):
-        """Get finger positions with cursor finger highlighting"""
-        if len(landmarks) < 21:
-            return {}
+    def _update_bbox(self, lm, width, height):
+        """Remember a square around the hand's bounding box grown by
+        crop_scale for the next find_hands. The square is shifted (not
+        clipped) to stay inside the frame, so the fixed-size square resize
+        never distorts the hand"""
+        xs, ys = lm[:, 0], lm[:, 1]
+        x_min, x_max = int(xs.min()), int(xs.max())
+        y_min, y_max = int(ys.min()), int(ys.max())
+        # At least 64 px, so a misdetected speck does not become the crop
+        side = int(max(x_max - x_min, y_max - y_min) * self.crop_scale) + 1
+        side = min(max(side, 64), width, height)
+        x0 = min(max((x_min + x_max - side) // 2, 0), width - side)
+        y0 = min(max((y_min + y_max - side) // 2, 0), height - side)
+        self._last_bbox = (x0, y0, x0 + side, y0 + side)
+    
+    def _draw_hand(self, frame, lm):
+        """Draw the hand skeleton: all connections in one polylines call,
+        then the joints and the cursor finger highlight"""
+        circle = cv2.circle
+        points = lm
+        cv2.polylines(frame, points[self._connections], False,
+                      _CONNECTION_COLOR, _CONNECTION_THICKNESS)
+        for center in points.tolist():
+            circle(frame, center, _JOINT_OUTLINE_RADIUS, _JOINT_OUTLINE_COLOR, _JOINT_THICKNESS)
+            circle(frame, center, _JOINT_RADIUS, _JOINT_COLOR, _JOINT_THICKNESS)
         
-        finger_positions = {}
-        finger_names = ['thumb', 'index', 'middle', 'ring', 'pinky']
+        # Highlight cursor control finger
+        cursor_id = 8 if self.cursor_finger == 'index' else 20
+        circle(frame, (int(lm[cursor_id, 0]), int(lm[cursor_id, 1])),
+               _CURSOR_HIGHLIGHT_RADIUS, _CURSOR_HIGHLIGHT_COLOR, -1)
+    
+    def poll_hands(self):
+        """Newest async result that find_hands has not returned yet, or None.
+        Lets a caller that skips find_hands on a static scene still pick up a
+        detection finished since; always None for the legacy solution"""
+        if self.landmarker is None:
+            return None
+        latest = self._latest_result
+        if latest[1] == self._returned_result[1]:
+            return None
+        self._returned_result = latest
+        # Optical flow continues from the frame this result was detected on
+        self._roi_gray = latest[2]
+        return latest[0]
+    
+    def set_roi_reference(self, frame_gray):
+        """Set the grayscale frame the next track_roi call flows from
+        (the frame the current landmarks were detected on). frame_gray is
+        the frame just passed to find_hands"""
+        if self.landmarker is None:
+            self._roi_gray = frame_gray
+            return
         
-        try:
-            for i, tip_id in enumerate(self.tip_ids):
-                if tip_id < len(landmarks):
-                    finger_positions[finger_names[i]] = {
-                        'x': landmarks[tip_id][1],
-                        'y': landmarks[tip_id][2],
-                        'tip_id': tip_id
-                    }
-            
-            # Add cursor control finger specific data
-            cursor_tip_id = 8 if self.cursor_finger == 'index' else 20
-            cursor_pip_id = 6 if self.cursor_finger == 'index' else 18
-            
-            if cursor_tip_id < len(landmarks):
-                finger_positions['cursor_finger'] = {
-                    'x': landmarks[cursor_tip_id][1],
-                    'y': landmarks[cursor_tip_id][2],
-                    'tip_id': cursor_tip_id
-                }
-            
-            if cursor_pip_id < len(landmarks):
-                finger_positions['cursor_finger_pip'] = {
-                    'x': landmarks[cursor_pip_id][1],
-                    'y': landmarks[cursor_pip_id][2]
-                }
-            
-            # Keep thumb data for pinch detection
-            if len(landmarks) > 4:
-                finger_positions['thumb_tip'] = {
-                    'x': landmarks[4][1],
-                    'y': landmarks[4][2]
-                }
-                
-        except Exception as e:
-            print(f"Finger position calculation error: {e}")
+        # Async results belong to an earlier frame: keep this gray frame with
+        # its pending timestamp until its own result arrives, and flow from
+        # the gray frame of the result find_hands actually returned
+        timestamp_ms = self._last_timestamp_ms
+        with self._result_lock:
+            entry = self._pending.get(timestamp_ms)
+            if entry is not None:
+                entry[1] = frame_gray
+            elif self._latest_result[1] == timestamp_ms:
+                self._latest_result = (self._latest_result[0], timestamp_ms, frame_gray)
+        _, returned_ms, returned_gray = self._returned_result
+        self._roi_gray = frame_gray if returned_ms == timestamp_ms else returned_gray
+    
+    def track_roi(self, frame_gray, prev_tip_xy):
+        """Follow the cursor finger tip into frame_gray without MediaPipe:
+        pyramidal Lucas-Kanade optical flow on a roi_size window around
+        prev_tip_xy. Returns the new (x, y) tip, or None if it was lost"""
+        prev_gray = self._roi_gray
+        self._roi_gray = frame_gray
+        if prev_gray is None or prev_gray.shape != frame_gray.shape:
+            return None
+        
+        # Window around the previous tip, shifted to stay inside the frame
+        size = self.roi_size
+        height, width = frame_gray.shape
+        x, y = prev_tip_xy
+        x0 = min(max(x - size // 2, 0), max(width - size, 0))
+        y0 = min(max(y - size // 2, 0), max(height - size, 0))
         
-        return finger_positions
+        point = self._roi_point
+        point[0, 0, 0] = x - x0
+        point[0, 0, 1] = y - y0
+        new_point, status, error = cv2.calcOpticalFlowPyrLK(
+            prev_gray[y0:y0 + size, x0:x0 + size],
+            frame_gray[y0:y0 + size, x0:x0 + size],
+            point, None, **self._lk_params
+        )
+        if not status[0, 0] or error[0, 0] > self.roi_max_error:
+            return None
+        
+        # A tip that left the window moved too far to trust the match
+        new_x, new_y = new_point[0, 0]
+        if not (0 <= new_x < size and 0 <= new_y < size):
+            return None
+        return int(round(new_x)) + x0, int(round(new_y)) + y0
+    
+    def follow_tip(self, frame, tip_xy):
+        """Move the last detected landmarks with the cursor finger tip
+        tracked by track_roi, so the preview skeleton and the next detection
+        crop follow the hand between full detections"""
+        lm = self._lm
+        tip_id = 8 if self.cursor_finger == 'index' else 20
+        lm += (tip_xy[0] - lm[tip_id, 0], tip_xy[1] - lm[tip_id, 1])
+        height, width = frame.shape[:2]
+        self._update_bbox(lm, width, height)
+        
+        if self.draw_preview:
+            self._draw_hand(frame, lm)
+    
+    def get_finger_positions(self, landmarks):
+        """Fingertip (x, y) rows, thumb..pinky, as a (5, 2) array
+        (empty if no hand)"""
+        if len(landmarks) < 21:
+            return _NO_LANDMARKS
+        return landmarks[self._tip_idx]
     
     def calculate_distance(self, point1, point2):
-        """Calculate distance between points"""
-        try:
-            return math.sqrt((point1['x'] - point2['x'])**2 + (point1['y'] - point2['y'])**2)
-        except Exception as e:
-            print(f"Distance calculation error: {e}")
-            return float('inf')
+        """Distance between two (x, y) points"""
+        return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
     
     def is_finger_up(self, landmarks, finger_idx):
-        """Enhanced finger detection with error handling"""
-        try:
-            if finger_idx == 0:  # Thumb
-                if len(landmarks) <= 4:
-                    return False
-                thumb_tip = landmarks[4]
-                thumb_ip = landmarks[3]
-                wrist = landmarks[0]
-                
-                tip_dist = math.sqrt((thumb_tip[1] - wrist[1])**2 + (thumb_tip[2] - wrist[2])**2)
-                ip_dist = math.sqrt((thumb_ip[1] - wrist[1])**2 + (thumb_ip[2] - wrist[2])**2)
-                
-                return tip_dist > ip_dist
-            else:
-                # For other fingers
-                if finger_idx >= len(self.tip_ids) or finger_idx >= len(self.pip_ids):
-                    return False
-                    
-                tip_id = self.tip_ids[finger_idx]
-                pip_id = self.pip_ids[finger_idx]
-                
-                if tip_id >= len(landmarks) or pip_id >= len(landmarks):
-                    return False
-                
-                tip = landmarks[tip_id]
-                pip = landmarks[pip_id]
-                
-                return tip[2] < pip[2]  # Tip above PIP
-        except Exception as e:
-            print(f"Finger detection error for finger {finger_idx}: {e}")
+        """Whether one finger (0 = thumb .. 4 = pinky) is up"""
+        if len(landmarks) < 21 or not 0 <= finger_idx < 5:
             return False
+        
+        if finger_idx == 0:  # Thumb
+            wrist = landmarks[0].astype(np.int64)
+            tip = landmarks[4] - wrist
+            ip = landmarks[3] - wrist
+            return bool(tip @ tip > ip @ ip)
+        
+        tip_id = self.tip_ids[finger_idx]
+        pip_id = self.pip_ids[finger_idx]
+        return bool(landmarks[tip_id, 1] < landmarks[pip_id, 1])  # Tip above PIP
+    
+    def fingers_up(self, landmarks):
+        """Up/down state of all five fingers (thumb..pinky) as a bool array"""
+        up = np.empty(5, dtype=np.bool_)
+        _fingers_up(landmarks, up)
+        return up
     
     def detect_gestures(self, landmarks):
         """Enhanced gesture detection with cursor finger awareness"""
-        try:
-            if len(landmarks) < 21:
-                return "no_hand"
-            
-            finger_positions = self.get_finger_positions(landmarks)
-            fingers_up = [self.is_finger_up(landmarks, i) for i in range(5)]
-            total_fingers = fingers_up.count(True)
-            
-            # Pinch detection (always thumb + index for consistency)
-            is_pinching, pinch_dist = self.detect_pinch_gesture(landmarks)
-            if is_pinching:
-                # Switch to pinky for cursor control during pinch
-                if self.cursor_finger != 'pinky':
-                    self.set_cursor_finger('pinky')
-                return "pinch"
-            
-            # Point gesture - depends on current cursor finger
-            cursor_finger_idx = 1 if self.cursor_finger == 'index' else 4  # Index=1, Pinky=4
-            
-            if cursor_finger_idx < len(fingers_up) and fingers_up[cursor_finger_idx]:
-                # Check if only cursor finger (and optionally thumb) is up
-                other_fingers = [i for i in range(5) if i != cursor_finger_idx and i != 0]
-                if not any(fingers_up[i] for i in other_fingers):
-                    # Switch back to index for normal pointing if not already
-                    if self.cursor_finger != 'index':
-                        self.set_cursor_finger('index')
-                    return "point"
-            
-            # Peace sign - index and middle
-            if len(fingers_up) >= 5 and fingers_up[1] and fingers_up[2] and not fingers_up[3] and not fingers_up[4]:
-                return "peace"
-            
-            # Fist - all down
-            if total_fingers <= 1:
-                return "fist"
-            
-            # Open hand - most fingers up
-            if total_fingers >= 4:
-                return "open_hand"
-            
-            return "other"
-            
-        except Exception as e:
-            print(f"Gesture detection error: {e}")
-            return "error"
+        if len(landmarks) < 21:
+            return "no_hand"
+        
+        # Pinch detection (always thumb + index for consistency)
+        is_pinching, pinch_dist = self.detect_pinch_gesture(landmarks)
+        if is_pinching:
+            # Switch to pinky for cursor control during pinch
+            if self.cursor_finger != 'pinky':
+                self.set_cursor_finger('pinky')
+            return "pinch"
+        
+        # Point gesture - depends on current cursor finger
+        if self.cursor_finger == 'index':
+            code = _classify_gesture(landmarks, self._fingers_buf, 1, self._other_index)
+        else:
+            code = _classify_gesture(landmarks, self._fingers_buf, 4, self._other_pinky)
+        
+        if code == _GESTURE_POINT and self.cursor_finger != 'index':
+            # Switch back to index for normal pointing
+            self.set_cursor_finger('index')
+        
+        return _GESTURE_NAMES[code]
     
     def detect_pinch_gesture(self, landmarks):
-        """Pinch detection with stability and error handling"""
-        try:
-            if len(landmarks) < 21:
-                return False, float('inf')
-            
-            finger_positions = self.get_finger_positions(landmarks)
-            
-            if 'thumb_tip' in finger_positions and 'index' in finger_positions:
-                thumb_tip = finger_positions['thumb_tip']
-                index_tip = finger_positions['index']
-                
-                pinch_distance = self.calculate_distance(thumb_tip, index_tip)
-                
-                # Add to history for stability
-                self.pinch_history.append(pinch_distance < self.pinch_threshold)
-                if len(self.pinch_history) > self.pinch_stability_count:
-                    self.pinch_history.pop(0)
-                
-                # Require consistent detection
-                stable_pinch = (len(self.pinch_history) >= self.pinch_stability_count and 
-                              sum(self.pinch_history) >= self.pinch_stability_count - 1)
-                
-                return stable_pinch, pinch_distance
-            
-            return False, float('inf')
-            
-        except Exception as e:
-            print(f"Pinch detection error: {e}")
+        """Pinch detection with stability"""
+        if len(landmarks) < 21:
             return False, float('inf')
+        
+        pinch_distance_sq = int(_pinch_distance_sq(landmarks))
+        
+        # Add to history for stability
+        count = self.pinch_stability_count
+        self.pinch_history[self._pinch_idx] = pinch_distance_sq < self._pinch_threshold_sq
+        self._pinch_idx = (self._pinch_idx + 1) % count
+        self._pinch_filled = min(self._pinch_filled + 1, count)
+        
+        # Require consistent detection
+        stable_pinch = (self._pinch_filled == count and 
+                      int(self.pinch_history.sum()) >= count - 1)
+        
+        return stable_pinch, math.sqrt(pinch_distance_sq)
     
     def get_cursor_finger_position(self, landmarks):
-        """Get current cursor control finger position with error handling"""
-        try:
-            if len(landmarks) < 21:
-                return {'x': 0, 'y': 0, 'valid': False, 'stability': 0}
-            
-            # Select finger based on current setting
-            tip_id = 8 if self.cursor_finger == 'index' else 20  # Index or pinky
-            pip_id = 6 if self.cursor_finger == 'index' else 18
-            mcp_id = 5 if self.cursor_finger == 'index' else 17
-            
-            if tip_id >= len(landmarks) or pip_id >= len(landmarks) or mcp_id >= len(landmarks):
-                return {'x': 0, 'y': 0, 'valid': False, 'stability': 0}
-            
-            tip = landmarks[tip_id]
-            pip = landmarks[pip_id]
-            mcp = landmarks[mcp_id]
-            
-            tip_x, tip_y = tip[1], tip[2]
-            pip_x, pip_y = pip[1], pip[2]
-            mcp_x, mcp_y = mcp[1], mcp[2]
-            
-            # Calculate stability
-            finger_length = math.sqrt((tip_x - mcp_x)**2 + (tip_y - mcp_y)**2)
-            length_stability = min(finger_length / 80, 1.0)
-            
-            # Check if finger is extended
-            is_extended = tip_y < pip_y
-            extension_stability = 1.0 if is_extended else 0.3
-            
-            stability = (length_stability + extension_stability) / 2
-            is_valid = finger_length > 20 and stability > 0.4
-            
-            return {
-                'x': tip_x,
-                'y': tip_y,
-                'valid': is_valid,
-                'stability': stability,
-                'finger_type': self.cursor_finger
-            }
-            
-        except Exception as e:
-            print(f"Cursor finger position error: {e}")
+        """Get current cursor control finger position"""
+        if len(landmarks) < 21:
             return {'x': 0, 'y': 0, 'valid': False, 'stability': 0}
+        
+        # Select finger based on current setting
+        tip_id = 8 if self.cursor_finger == 'index' else 20  # Index or pinky
+        pip_id = 6 if self.cursor_finger == 'index' else 18
+        mcp_id = 5 if self.cursor_finger == 'index' else 17
+        
+        is_valid, stability = _cursor_finger_metrics(landmarks, tip_id, pip_id, mcp_id)
+        
+        return {
+            'x': int(landmarks[tip_id, 0]),
+            'y': int(landmarks[tip_id, 1]),
+            'valid': bool(is_valid),
+            'stability': float(stability),
+            'finger_type': self.cursor_finger
+        }
     
     def get_index_finger_position(self, landmarks):
         """Compatibility method - now uses cursor finger"""
         return self.get_cursor_finger_position(landmarks)
     
+    def close(self):
+        """Release the MediaPipe graph and its worker threads"""
+        if self.landmarker is not None:
+            self.landmarker.close()
+        else:
+            self.hands.close()
+    
     def is_pinch_active(self, landmarks):
-        """Check if pinch is active with error handling"""
-        try:
-            is_pinching, _ = self.detect_pinch_gesture(landmarks)
-            return is_pinching
-        except Exception as e:
-            print(f"Pinch active check error: {e}")
-            return False
+        """Check if pinch is active"""
+        is_pinching, _ = self.detect_pinch_gesture(landmarks)
+        return is_pinching
     
     def reset_tracking_state(self):
         """Reset tracking state"""
-        try:
-            self.gesture_history.clear()
-            self.pinch_history.clear()
-            self.cursor_finger = 'index'  # Reset to default
-        except Exception as e:
-            print(f"State reset error: {e}")
+        self.pinch_history[:] = 0
+        self._pinch_idx = self._pinch_filled = 0
+        self._last_bbox = None
+        self._latest_result = self._returned_result = ([], 0, None)
+        self.cursor_finger = 'index'  # Reset to default
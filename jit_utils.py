@@ -0,0 +1,26 @@
+"""
+Optional Numba support for the numeric hot paths.
+
+When numba is installed, functions decorated with ``njit`` are compiled to
+machine code. Without it they run as plain Python, so the application keeps
+working (just slower) on machines where numba is not available.
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """Drop-in for ``numba.njit`` that is a no-op when numba is missing"""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # Support both the bare ``@njit`` and the ``@njit(...)`` forms
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
+
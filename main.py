@@ -17,6 +17,8 @@ Date: July 2025
 
 import sys
 import os
+import importlib.util
+import cv2
 from hand_tracker import HandTracker
 from cursor_controller import CursorController
 from gui_controller import GUIController
@@ -26,10 +28,9 @@ def check_dependencies():
     required_modules = ['cv2', 'mediapipe', 'pyautogui', 'tkinter', 'PIL', 'requests']
     missing_modules = []
     
+    # find_spec only locates each module on disk instead of importing it
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(module)
     
     if missing_modules:
@@ -71,6 +72,10 @@ def main():
     # Print setup guide
     print_droidcam_setup_guide()
     
+    # A couple of OpenCV worker threads is plenty for the per-frame resize and
+    # color conversions; more only compete with MediaPipe's own threads
+    cv2.setNumThreads(2)
+    
     try:
         # Initialize components
         print("\nInitializing hand tracker...")
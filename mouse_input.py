@@ -0,0 +1,314 @@
+"""
+Low-latency mouse output.
+
+Cursor moves, button presses and scrolls go straight to the OS input API
+through ctypes: SendInput on Windows, the XTest extension on X11 and
+CGEventPost on macOS. Anything a native backend can't do (or a platform
+where none can be loaded) falls back to pyautogui. Native backends keep
+pyautogui's FAILSAFE: every action first reads the pointer position and
+raises pyautogui.FailSafeException if it sits on a FAILSAFE_POINTS corner.
+"""
+
+import ctypes
+import ctypes.util
+import sys
+
+import pyautogui
+
+
+class PyAutoGUIMouse:
+    """Mouse output through pyautogui (also the base for native backends)"""
+    name = "pyautogui"
+
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+    def position(self):
+        """Current pointer position (native backends read it directly)"""
+        return pyautogui.position()
+
+    def _fail_safe_check(self):
+        """Abort like pyautogui does when the user has pushed the pointer
+        into a screen corner"""
+        if pyautogui.FAILSAFE and tuple(self.position()) in pyautogui.FAILSAFE_POINTS:
+            raise pyautogui.FailSafeException(
+                "fail-safe triggered from mouse moving to a corner of the screen")
+
+    def move_to(self, x, y):
+        pyautogui.moveTo(x, y, duration=0, _pause=False)
+
+    def press(self, button="left"):
+        pyautogui.mouseDown(button=button, _pause=False)
+
+    def release(self, button="left"):
+        pyautogui.mouseUp(button=button, _pause=False)
+
+    def click(self, button="left", clicks=1):
+        pyautogui.click(button=button, clicks=clicks, _pause=False)
+
+    def scroll(self, clicks):
+        pyautogui.scroll(clicks, _pause=False)
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long),
+                ("dy", ctypes.c_long),
+                ("mouseData", ctypes.c_long),
+                ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong),
+                ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+
+class _INPUT(ctypes.Structure):
+    # MOUSEINPUT is the largest member of the INPUT union, so it can stand in for it
+    _fields_ = [("type", ctypes.c_ulong),
+                ("mi", _MOUSEINPUT)]
+
+
+class Win32Mouse(PyAutoGUIMouse):
+    """Mouse output through user32.SendInput with reused INPUT buffers"""
+    name = "SendInput"
+
+    INPUT_MOUSE = 0
+    MOUSEEVENTF_MOVE = 0x0001
+    MOUSEEVENTF_ABSOLUTE = 0x8000
+    MOUSEEVENTF_WHEEL = 0x0800
+    BUTTON_FLAGS = {"left": (0x0002, 0x0004), "right": (0x0008, 0x0010)}
+
+    def __init__(self, screen_width, screen_height):
+        super().__init__(screen_width, screen_height)
+        self._send_input = ctypes.windll.user32.SendInput
+        self._input_size = ctypes.sizeof(_INPUT)
+        self._get_cursor_pos = ctypes.windll.user32.GetCursorPos
+        self._cursor_pos = _POINT()
+
+        # Absolute coordinates are normalized to 0..65535 over the primary screen
+        self._scale_x = 65535 / max(screen_width - 1, 1)
+        self._scale_y = 65535 / max(screen_height - 1, 1)
+
+        # One preallocated event for moves/scrolls and a down/up pair for clicks
+        self._single = (_INPUT * 1)()
+        self._single[0].type = self.INPUT_MOUSE
+        self._pair = (_INPUT * 2)()
+        self._pair[0].type = self._pair[1].type = self.INPUT_MOUSE
+
+    def _send_single(self, flags, dx=0, dy=0, data=0):
+        mi = self._single[0].mi
+        mi.dx, mi.dy, mi.mouseData, mi.dwFlags = dx, dy, data, flags
+        self._send_input(1, self._single, self._input_size)
+
+    def position(self):
+        self._get_cursor_pos(ctypes.byref(self._cursor_pos))
+        return self._cursor_pos.x, self._cursor_pos.y
+
+    def move_to(self, x, y):
+        self._fail_safe_check()
+        self._send_single(self.MOUSEEVENTF_MOVE | self.MOUSEEVENTF_ABSOLUTE,
+                          int(x * self._scale_x + 0.5), int(y * self._scale_y + 0.5))
+
+    def press(self, button="left"):
+        self._fail_safe_check()
+        self._send_single(self.BUTTON_FLAGS[button][0])
+
+    def release(self, button="left"):
+        self._fail_safe_check()
+        self._send_single(self.BUTTON_FLAGS[button][1])
+
+    def click(self, button="left", clicks=1):
+        self._fail_safe_check()
+        down, up = self.BUTTON_FLAGS[button]
+        self._pair[0].mi.dwFlags = down
+        self._pair[1].mi.dwFlags = up
+        for _ in range(clicks):
+            self._send_input(2, self._pair, self._input_size)
+
+    def scroll(self, clicks):
+        # Same wheel units pyautogui sends for scroll(clicks)
+        self._fail_safe_check()
+        self._send_single(self.MOUSEEVENTF_WHEEL, data=clicks)
+
+
+class XTestMouse(PyAutoGUIMouse):
+    """Mouse output through the X11 XTest extension"""
+    name = "XTest"
+
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    SCROLL_UP, SCROLL_DOWN = 4, 5
+
+    def __init__(self, screen_width, screen_height):
+        super().__init__(screen_width, screen_height)
+        xlib_path = ctypes.util.find_library("X11")
+        xtst_path = ctypes.util.find_library("Xtst")
+        if not xlib_path or not xtst_path:
+            raise OSError("libX11/libXtst not found")
+
+        xlib = ctypes.CDLL(xlib_path)
+        xtst = ctypes.CDLL(xtst_path)
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XFlush.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + [ctypes.c_void_p] * 7
+        xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                              ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+                                              ctypes.c_ulong]
+
+        # This connection is driven from the mouse worker thread while Tk
+        # makes its own Xlib calls on the main thread; XInitThreads has to
+        # come before Tk opens its display (CursorController is created first)
+        xlib.XInitThreads()
+        self._display = xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("cannot open X display")
+
+        # XQueryPointer outputs: root, child, root x/y, window x/y, button mask
+        self._query_pointer = xlib.XQueryPointer
+        self._root = xlib.XDefaultRootWindow(self._display)
+        self._windows = (ctypes.c_ulong(), ctypes.c_ulong())
+        self._coords = (ctypes.c_int(), ctypes.c_int(), ctypes.c_int(), ctypes.c_int())
+        self._mask = ctypes.c_uint()
+        self._flush = xlib.XFlush
+        self._motion = xtst.XTestFakeMotionEvent
+        self._button = xtst.XTestFakeButtonEvent
+
+    def position(self):
+        root, child = self._windows
+        root_x, root_y, win_x, win_y = self._coords
+        self._query_pointer(self._display, self._root, ctypes.byref(root), ctypes.byref(child),
+                            ctypes.byref(root_x), ctypes.byref(root_y),
+                            ctypes.byref(win_x), ctypes.byref(win_y), ctypes.byref(self._mask))
+        return root_x.value, root_y.value
+
+    def move_to(self, x, y):
+        self._fail_safe_check()
+        self._motion(self._display, -1, int(x), int(y), 0)
+        self._flush(self._display)
+
+    def press(self, button="left"):
+        self._fail_safe_check()
+        self._button(self._display, self.BUTTONS[button], 1, 0)
+        self._flush(self._display)
+
+    def release(self, button="left"):
+        self._fail_safe_check()
+        self._button(self._display, self.BUTTONS[button], 0, 0)
+        self._flush(self._display)
+
+    def click(self, button="left", clicks=1):
+        self._fail_safe_check()
+        code = self.BUTTONS[button]
+        for _ in range(clicks):
+            self._button(self._display, code, 1, 0)
+            self._button(self._display, code, 0, 0)
+        self._flush(self._display)
+
+    def scroll(self, clicks):
+        self._fail_safe_check()
+        code = self.SCROLL_UP if clicks > 0 else self.SCROLL_DOWN
+        for _ in range(abs(clicks)):
+            self._button(self._display, code, 1, 0)
+            self._button(self._display, code, 0, 0)
+        self._flush(self._display)
+
+
+class _CGPoint(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_double), ("y", ctypes.c_double)]
+
+
+class QuartzMouse(PyAutoGUIMouse):
+    """Mouse moves and single clicks through CGEventPost (scroll and
+    multi-clicks stay on pyautogui)"""
+    name = "CGEventPost"
+
+    MOUSE_MOVED = 5
+    LEFT_DRAGGED = 6
+    BUTTON_EVENTS = {"left": (1, 2, 0), "right": (3, 4, 1)}  # down, up, button number
+
+    def __init__(self, screen_width, screen_height):
+        super().__init__(screen_width, screen_height)
+        quartz = ctypes.CDLL(ctypes.util.find_library("ApplicationServices"))
+        quartz.CGEventCreateMouseEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint32,
+                                                   _CGPoint, ctypes.c_uint32]
+        quartz.CGEventCreateMouseEvent.restype = ctypes.c_void_p
+        quartz.CGEventPost.argtypes = [ctypes.c_uint32, ctypes.c_void_p]
+        quartz.CFRelease.argtypes = [ctypes.c_void_p]
+        quartz.CGEventCreate.argtypes = [ctypes.c_void_p]
+        quartz.CGEventCreate.restype = ctypes.c_void_p
+        quartz.CGEventGetLocation.argtypes = [ctypes.c_void_p]
+        quartz.CGEventGetLocation.restype = _CGPoint
+
+        self._create = quartz.CGEventCreateMouseEvent
+        self._post = quartz.CGEventPost
+        self._release = quartz.CFRelease
+        self._create_event = quartz.CGEventCreate
+        self._get_location = quartz.CGEventGetLocation
+        # Button events are posted at the last known position, so start from the real one
+        x, y = self.position()
+        self._point = _CGPoint(x, y)
+        self._left_down = False
+
+    def _post_event(self, event_type, button=0):
+        event = self._create(None, event_type, self._point, button)
+        self._post(0, event)  # kCGHIDEventTap
+        self._release(event)
+
+    def position(self):
+        # A blank event carries the current pointer location
+        event = self._create_event(None)
+        location = self._get_location(event)
+        self._release(event)
+        return int(location.x), int(location.y)
+
+    def move_to(self, x, y):
+        self._fail_safe_check()
+        self._point.x, self._point.y = x, y
+        # While the left button is held, moves must be drags for the target app
+        self._post_event(self.LEFT_DRAGGED if self._left_down else self.MOUSE_MOVED)
+
+    def press(self, button="left"):
+        self._fail_safe_check()
+        down, _, number = self.BUTTON_EVENTS[button]
+        self._post_event(down, number)
+        if button == "left":
+            self._left_down = True
+
+    def release(self, button="left"):
+        self._fail_safe_check()
+        _, up, number = self.BUTTON_EVENTS[button]
+        self._post_event(up, number)
+        if button == "left":
+            self._left_down = False
+
+    def click(self, button="left", clicks=1):
+        if clicks != 1:
+            super().click(button, clicks)
+            return
+        self.press(button)
+        self.release(button)
+
+
+def create_mouse(screen_width, screen_height):
+    """Return the fastest mouse backend that loads on this platform"""
+    if sys.platform == "win32":
+        backends = [Win32Mouse]
+    elif sys.platform == "darwin":
+        backends = [QuartzMouse]
+    else:
+        backends = [XTestMouse]
+
+    for backend in backends:
+        try:
+            mouse = backend(screen_width, screen_height)
+            print(f"Mouse output: {mouse.name}")
+            return mouse
+        except Exception as e:
+            print(f"{backend.name} mouse output unavailable ({e}), using pyautogui")
+
+    return PyAutoGUIMouse(screen_width, screen_height)
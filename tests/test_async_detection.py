@@ -0,0 +1,130 @@
+"""
+process_video with an asynchronous (LIVE_STREAM) landmarker whose results
+arrive one frame late: a hand that enters and then holds still must still
+be picked up, even though the frame-diff gate stops calling find_hands.
+"""
+
+import collections
+import importlib.util
+import os
+import sys
+import threading
+import types
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HAVE_DEPS = all(importlib.util.find_spec(name) is not None
+                for name in ("mediapipe", "tkinter", "PIL"))
+
+if HAVE_DEPS:
+    try:
+        import pyautogui  # noqa: F401
+    except Exception:
+        # pyautogui needs a display to import; the loop under test only
+        # talks to the cursor through the stub below
+        sys.modules["pyautogui"] = types.SimpleNamespace(size=lambda: (1920, 1080))
+    import gui_controller
+    from hand_tracker import HandTracker
+
+# A hand in normalized image coordinates, index finger pointing up
+_HAND = [(0.50, 0.80), (0.42, 0.74), (0.37, 0.66), (0.34, 0.60), (0.32, 0.55),
+         (0.46, 0.60), (0.46, 0.48), (0.46, 0.40), (0.46, 0.32),
+         (0.52, 0.60), (0.52, 0.66), (0.52, 0.70), (0.52, 0.72),
+         (0.57, 0.62), (0.57, 0.68), (0.57, 0.71), (0.57, 0.73),
+         (0.62, 0.64), (0.62, 0.69), (0.62, 0.72), (0.62, 0.74)]
+
+
+class LateLandmarker:
+    """Stands in for a LIVE_STREAM HandLandmarker: each submitted image is
+    answered once the next camera frame has been captured"""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.queue = []
+
+    def detect_async(self, image, timestamp_ms):
+        has_hand = image.data.any()
+        self.queue.append((image, timestamp_ms, has_hand))
+
+    def deliver(self):
+        for image, timestamp_ms, has_hand in self.queue:
+            hands = []
+            if has_hand:
+                hands = [[types.SimpleNamespace(x=x, y=y, z=0.0) for x, y in _HAND]]
+            result = types.SimpleNamespace(hand_landmarks=hands)
+            self.tracker._on_result(result, image, timestamp_ms)
+        self.queue.clear()
+
+    def close(self):
+        pass
+
+
+class StillCamera:
+    """One empty frame, then the same frame with a hand held still"""
+    frame_width = 640
+    frame_height = 480
+
+    def __init__(self, landmarker, stop_event, frames=12):
+        self.landmarker = landmarker
+        self.stop_event = stop_event
+        self.frames = frames
+        self.count = 0
+        self.empty = np.zeros((480, 640, 3), np.uint8)
+        self.hand = self.empty.copy()
+        self.hand[100:400, 200:450] = 200
+
+    def get_frame(self, timeout=0.1):
+        self.landmarker.deliver()
+        self.count += 1
+        if self.count >= self.frames:
+            self.stop_event.set()
+        return True, (self.empty if self.count == 1 else self.hand).copy()
+
+
+class RecordingCursor:
+    smoothing_factor = 0.5
+
+    def __init__(self):
+        self.moves = []
+
+    def map_coordinates(self, x, y, width, height):
+        return x, y
+
+    def move_cursor(self, x, y):
+        self.moves.append((x, y))
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@unittest.skipUnless(HAVE_DEPS, "needs mediapipe, tkinter and Pillow")
+class AsyncDetectionTest(unittest.TestCase):
+
+    def test_hand_found_after_scene_goes_still(self):
+        tracker = HandTracker(model_path="missing.task")
+        tracker.landmarker = LateLandmarker(tracker)
+        stop_event = threading.Event()
+        camera = StillCamera(tracker.landmarker, stop_event)
+        cursor = RecordingCursor()
+
+        gui = object.__new__(gui_controller.GUIController)
+        gui.__dict__.update(
+            hand_tracker=tracker, cursor_controller=cursor, camera_manager=camera,
+            is_running=True, _smooth=0.5, _sens=1.0, _stop_event=stop_event,
+            colors={'primary': 'blue', 'secondary': 'gray'}, _ui_state={},
+            display_frames=collections.deque(maxlen=1),
+            _frame_times=collections.deque(maxlen=60),
+            detect_interval=3, frame_diff_threshold=2.0, inference_size=(256, 192),
+        )
+        gui._gesture_table = {}
+        gui.process_video()
+
+        self.assertTrue(cursor.moves)
+        self.assertNotEqual(gui._ui_state["gesture"][1], "No Hand")
+
+
+if __name__ == "__main__":
+    unittest.main()